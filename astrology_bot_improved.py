@@ -5,14 +5,23 @@ Comprehensive error handling, logging, and lifecycle management
 """
 
 import os
+import re
 import sys
 import logging
 import asyncio
 import signal
+import socket
 import gc
+import calendar
+import types
+import functools
+import contextlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Import modules with error handling
@@ -31,12 +40,14 @@ except ImportError as e:
 
 # Telegram imports
 try:
-    from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
+    from telegram import Update, MessageEntity, ReplyKeyboardMarkup, ReplyKeyboardRemove
     from telegram.ext import (
         Application, CommandHandler, MessageHandler,
         filters, ContextTypes, ConversationHandler
     )
-    from telegram.error import TelegramError, NetworkError, TimedOut, BadRequest
+    from telegram.error import TelegramError, NetworkError, TimedOut, BadRequest, RetryAfter
+    from telegram.request import HTTPXRequest
+    import httpx
 except ImportError:
     print("Error: python-telegram-bot not installed!")
     print("Install with: pip install python-telegram-bot==21.0.1")
@@ -44,6 +55,272 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# bot_data key under which the shared main menu markup is stored
+MAIN_KEYBOARD_KEY = 'main_kb'
+
+# Maximum number of user profiles kept in memory, and for how long (seconds)
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TTL = 60.0
+
+# How long /stats reuses the last database statistics (seconds)
+STATS_CACHE_TTL = 30.0
+
+# Broadcast pacing: Telegram allows about 30 messages per second per bot, so
+# /broadcast sends in concurrent batches of this size, one batch per second
+BROADCAST_RATE = 30
+# Recipient IDs are read from the database this many at a time
+BROADCAST_PAGE_SIZE = 1000
+# Retries per recipient after flood control (429) or a transient network error
+BROADCAST_MAX_RETRIES = 3
+
+# Generational GC thresholds: allocations before a gen0 pass, then gen0/gen1
+# passes before the next older generation is collected (CPython default 700, 10, 10)
+GC_THRESHOLDS = (700 * 8, 10 * 8, 10 * 8)
+
+# Upper bound for each application shutdown step (seconds)
+SHUTDOWN_STEP_TIMEOUT = 5.0
+
+# TCP keepalive for Bot API connections, so NATs and proxies do not silently
+# drop idle pooled sockets. Idle/interval tuning is only set where the platform
+# exposes it.
+TCP_KEEPALIVE_IDLE = 30
+TCP_KEEPALIVE_INTERVAL = 10
+_SOCKET_OPTIONS = tuple(
+    [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    + [
+        (socket.IPPROTO_TCP, getattr(socket, name), value)
+        for name, value in (("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+                            ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL))
+        if hasattr(socket, name)
+    ]
+)
+
+
+# Worker threads dedicated to SQLite calls; each keeps its own connection
+DB_WORKERS = 4
+
+# Month input lookup used by the DOB conversation: every accepted answer
+# (1-12, zero-padded 01-09, or a name abbreviated to at least three letters)
+# maps straight to its month number.
+_MONTH_FULL_NAMES = (
+    '', 'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+)
+_MONTH_LOOKUP = types.MappingProxyType({
+    **{str(number): number for number in range(1, 13)},
+    **{f'{number:02d}': number for number in range(1, 10)},
+    **{
+        name[:length]: number
+        for number, name in enumerate(_MONTH_FULL_NAMES) if name
+        for length in range(3, len(name) + 1)
+    },
+})
+_MONTH_DISPLAY = tuple(calendar.month_name)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_long_date(value: date) -> str:
+    """Render a date as e.g. 'June 15, 1995', memoized per date."""
+    return value.strftime('%B %d, %Y')
+
+
+# Emoji shown next to each fact category
+_FACT_EMOJI = {
+    "psychology": "🧠",
+    "science": "🔬",
+    "numerology": "🔢",
+    "astrology": "⭐",
+    "general": "💡"
+}
+_DEFAULT_FACT_EMOJI = "🎲"
+
+# Static reply texts
+_WELCOME_TEMPLATE = (
+    "🌟 Welcome {name}! I'm your astrology companion.\n\n"
+    "✨ What I can help you with:\n"
+    "• Daily horoscopes and personalized readings\n"
+    "• Numerology and life path analysis\n"
+    "• Zodiac compatibility checks\n"
+    "• Lucky numbers and cosmic insights\n\n"
+    "👉 Use the menu below to get started!"
+)
+
+_HELP_TEXT = (
+    "📚 Available Features\n\n"
+    "🎂 Set DOB - Configure your birth date for personalized readings\n"
+    "🔮 Today's Reading - Get your daily horoscope\n"
+    "🔢 Numerology - Discover your life path number\n"
+    "💕 Compatibility - Check relationship compatibility\n"
+    "✨ Zodiac Secret - Random cosmic insights\n\n"
+    "📋 Commands:\n"
+    "/setdob - Set your birth date\n"
+    "/today - Get daily reading\n"
+    "/numerology - View numerology info\n"
+    "/compatibility - Check compatibility\n"
+    "/help - Show this help message"
+)
+
+
+def _code_entities(text: str, pattern: str) -> Tuple[MessageEntity, ...]:
+    """
+    Build code-formatting entities for every match of pattern in text.
+
+    Telegram measures entity offsets in UTF-16 code units, so the emoji in
+    the text are counted accordingly.
+
+    Args:
+        text: Message text
+        pattern: Regex matching the spans to format
+
+    Returns:
+        Tuple[MessageEntity, ...]: Entities to send alongside the text
+    """
+    def utf16_len(value: str) -> int:
+        return len(value.encode('utf-16-le')) // 2
+
+    return tuple(
+        MessageEntity(
+            MessageEntity.CODE,
+            offset=utf16_len(text[:match.start()]),
+            length=utf16_len(match.group())
+        )
+        for match in re.finditer(pattern, text)
+    )
+
+
+# Help is static, so its formatting is sent as ready-made entities instead of
+# having Telegram parse Markdown on every request
+_HELP_ENTITIES = _code_entities(_HELP_TEXT, r'(?m)^/\w+')
+
+
+_SET_DOB_PROMPT = (
+    "🎂 Let's set your birth date!\n\n"
+    "Please enter the DAY of your birth (1-31):"
+)
+
+_DOB_REQUIRED_READING = (
+    "⚠️ Please set your birth date first!\n\n"
+    "Use the 'Set DOB' button below to get started."
+)
+
+_DOB_REQUIRED_NUMEROLOGY = (
+    "⚠️ Please set your birth date first!\n\n"
+    "Use the 'Set DOB' button to unlock numerology insights."
+)
+
+_DOB_REQUIRED_COMPATIBILITY = (
+    "⚠️ Please set your birth date first!\n\n"
+    "You need to set your DOB before checking compatibility."
+)
+
+_NUMEROLOGY_TEMPLATE = (
+    "🔢 Your Numerology Profile\n\n"
+    "Life Path Number: {life_path}\n\n"
+    "📊 Calculation:\n{calculation}\n\n"
+    "✨ Meaning:\n{meaning}"
+)
+
+_COMPATIBILITY_PROMPT_TEMPLATE = (
+    "💕 Compatibility Check\n\n"
+    "Your Sign: {zodiac}\n"
+    "Your Life Path: {life_path}\n\n"
+    "📅 Now, send your partner's birth date in this format:\n"
+    "`DD-MM-YYYY` (e.g., 15-06-1995)"
+)
+
+_STATS_TEMPLATE = (
+    "📊 Bot Statistics\n\n"
+    "⏱️ Uptime: {hours:.2f} hours\n"
+    "👥 Total Users: {users}\n"
+    "📝 Total Facts: {facts}\n"
+    "⚡ Commands Processed: {commands}\n"
+    "❌ Errors: {errors}"
+)
+_STATS_ZODIAC_HEADER = "\n\n♈ Zodiac Distribution:\n"
+
+_BROADCAST_USAGE = "Usage: /broadcast <message>"
+_BROADCAST_DISABLED = "📢 Broadcasting is disabled."
+_BROADCAST_STARTED = "📢 Broadcast started. This message will be updated when it finishes."
+_BROADCAST_RUNNING = "📢 A broadcast is already running. Please wait for it to finish."
+_BROADCAST_DONE_TEMPLATE = "📢 Broadcast finished: {sent} sent, {failed} failed."
+_BROADCAST_INTERRUPTED_TEMPLATE = (
+    "📢 Broadcast interrupted by shutdown: {sent} sent, {failed} failed."
+)
+
+_DEFAULT_REPLY = (
+    "👋 Use the menu buttons below to explore features!\n\n"
+    "Type /help to see all available commands."
+)
+
+# Every handler reads update.message, so ask Telegram for nothing else
+_ALLOWED_UPDATES = [Update.MESSAGE]
+
+# Handler filter patterns, compiled once at import
+# (keywords must start a word, so "reset" or "sunset" no longer open the DOB flow)
+_DOB_ENTRY_RE = re.compile(r'\b(?:set|birth|dob)', re.IGNORECASE)
+_CANCEL_RE = re.compile(r'\b(?:cancel|stop|quit)', re.IGNORECASE)
+# DOB conversation inputs: a day 1-31 (optionally zero-padded) and a 4-digit year.
+# Days are few enough to resolve with a single lookup, like months.
+_DAY_LOOKUP = types.MappingProxyType({
+    **{str(day): day for day in range(1, 32)},
+    **{f'{day:02d}': day for day in range(1, 10)},
+})
+_YEAR_RE = re.compile(r'\d{4}', re.ASCII)
+_COMPAT_DATE_RE = re.compile(r'^(?P<day>\d{2})-(?P<month>\d{2})-(?P<year>\d{4})$', re.ASCII)
+
+# Free-text router: alternatives are tried in order, so earlier routes win
+# regardless of where their keyword appears in the message. There is no DOB
+# route: start_set_dob must only run as the ConversationHandler entry point
+# (_DOB_ENTRY_RE), otherwise the follow-up day/month/year replies are never
+# picked up by the conversation.
+_TEXT_ROUTER_RE = re.compile(
+    r'.*?(?P<today>today|reading|horoscope|daily)'
+    r'|.*?(?P<numerology>numerology|life path)'
+    r'|.*?(?P<secret>fact|secret|insight)'
+    r'|.*?(?P<compatibility>compatibility|match)'
+    r'|.*?(?P<help>help|commands)',
+    re.DOTALL
+)
+
+
+# User-facing text per Telegram error type. TimedOut and BadRequest subclass
+# NetworkError, so lookups walk the MRO and the most specific entry wins.
+_ERROR_MESSAGES = {
+    TimedOut: "Request timed out. Please try again.",
+    BadRequest: "Invalid request. Please check your input.",
+    NetworkError: "Network error. Please check your connection and try again.",
+}
+_DEFAULT_ERROR_MESSAGE = "Sorry, something went wrong. Please try again."
+
+
+def _error_message_for(error: BaseException) -> str:
+    """Pick the user-facing message for an error, preferring its exact type."""
+    for cls in type(error).__mro__:
+        message = _ERROR_MESSAGES.get(cls)
+        if message is not None:
+            return message
+    return _DEFAULT_ERROR_MESSAGE
+
+
+class KeepAliveHTTPXRequest(HTTPXRequest):
+    """
+    HTTPXRequest whose connections use the TCP keepalive _SOCKET_OPTIONS.
+
+    HTTPXRequest's own socket_options argument builds a bare transport, and
+    httpx then ignores the client's pool limits and HTTP version. Building the
+    transport here keeps all three.
+    """
+
+    def _build_client(self) -> httpx.AsyncClient:
+        client_kwargs = dict(self._client_kwargs)
+        client_kwargs["transport"] = httpx.AsyncHTTPTransport(
+            limits=client_kwargs["limits"],
+            http1=client_kwargs["http1"],
+            http2=client_kwargs["http2"],
+            socket_options=_SOCKET_OPTIONS,
+        )
+        return httpx.AsyncClient(**client_kwargs)
+
 
 class BotState(Enum):
     """Bot operational states."""
@@ -58,22 +335,15 @@ class BotState(Enum):
 @dataclass
 class BotMetrics:
     """Container for bot metrics."""
-    startup_time: datetime
+    startup_time: datetime  # wall-clock start, for display only
     total_commands: int = 0
     total_errors: int = 0
     active_conversations: int = 0
-
-    def increment_commands(self):
-        """Increment command counter."""
-        self.total_commands += 1
-
-    def increment_errors(self):
-        """Increment error counter."""
-        self.total_errors += 1
+    start_monotonic: float = field(default_factory=time.monotonic)
 
     def get_uptime(self) -> float:
-        """Get uptime in seconds."""
-        return (datetime.now() - self.startup_time).total_seconds()
+        """Get uptime in seconds, unaffected by wall-clock adjustments."""
+        return time.monotonic() - self.start_monotonic
 
 
 class AstrologyBot:
@@ -95,28 +365,234 @@ class AstrologyBot:
             config: Bot configuration object
         """
         self.config = config
+        self._admin_ids = frozenset(config.admin_ids)
         self.db = DatabaseManager(config.db_path)
+        self._db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
         self.astro = AstrologyCalculator()
         self.application = None
         self.state = BotState.IDLE
         self.metrics = BotMetrics(startup_time=datetime.now())
-        self._shutdown_event = asyncio.Event()
+        # Created on first use so it binds to the loop that actually runs the bot
+        self._shutdown_event: Optional[asyncio.Event] = None
+
+        # The main menu never changes, so build the markup once and share it
+        self._fallback_keyboard = ReplyKeyboardMarkup([["Help"]], resize_keyboard=True)
+        try:
+            self._main_keyboard = ReplyKeyboardMarkup(MAIN_KEYBOARD, resize_keyboard=True)
+        except Exception as e:
+            logger.error("Keyboard creation failed: %s", e)
+            self._main_keyboard = self._fallback_keyboard
+
+        # LRU of user_id -> (expires_at, (birth_date, zodiac_sign, life_path_number))
+        self._user_cache: "OrderedDict[int, Tuple[float, Tuple[date, str, int]]]" = OrderedDict()
+        # user_id -> sequence number of that user's latest DOB write. A cache
+        # fill is dropped if the number changed while its DB read was running,
+        # so a read that overlapped a save cannot cache the old row. Bounded
+        # like the cache; a pruned entry only ever causes a skipped fill.
+        self._user_writes: "OrderedDict[int, int]" = OrderedDict()
+        self._write_seq = 0
+
+        # (expires_at, stats) for the last get_database_stats() result
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+        # The running /broadcast, if any; only one may run at a time
+        self.broadcast_task: Optional[asyncio.Task] = None
 
         logger.info("Bot components initialized")
 
     def get_main_keyboard(self) -> ReplyKeyboardMarkup:
         """
-        Create main menu keyboard with error handling.
+        Get the cached main menu keyboard.
 
         Returns:
             ReplyKeyboardMarkup: Main keyboard layout
         """
-        try:
-            return ReplyKeyboardMarkup(MAIN_KEYBOARD, resize_keyboard=True)
-        except Exception as e:
-            logger.error(f"Keyboard creation failed: {e}")
-            # Fallback minimal keyboard
-            return ReplyKeyboardMarkup([["Help"]], resize_keyboard=True)
+        return self._main_keyboard
+
+    def get_shutdown_event(self) -> asyncio.Event:
+        """
+        Get the event that signals shutdown, creating it inside the running loop.
+
+        Returns:
+            asyncio.Event: Shutdown event
+        """
+        if self._shutdown_event is None:
+            asyncio.get_running_loop()  # raises if called outside the event loop
+            self._shutdown_event = asyncio.Event()
+        return self._shutdown_event
+
+    def run_db(self, func, *args) -> "asyncio.Future[Any]":
+        """
+        Run a blocking database call on the dedicated DB worker threads.
+
+        The call is submitted immediately; await the returned future for the result.
+
+        Args:
+            func: DatabaseManager method to call
+            *args: Positional arguments for the call
+
+        Returns:
+            asyncio.Future: Resolves to the result of the call
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._db_executor, functools.partial(func, *args))
+
+    async def cancel_broadcast(self) -> None:
+        """Cancel a running /broadcast and wait until it has finished unwinding."""
+        task = self.broadcast_task
+        if task is None or task.done():
+            return
+
+        logger.info("Cancelling running broadcast")
+        task.cancel()
+        # gather() collects the task's CancelledError instead of raising it here
+        await asyncio.gather(task, return_exceptions=True)
+
+    def close(self) -> None:
+        """Stop the DB worker threads and close their connections."""
+        self._db_executor.shutdown(wait=True)
+        self.db.close()
+
+    def _remember_user(self, user_id: int, user_data: Tuple[date, str, int]) -> None:
+        """Store a user profile in the LRU cache, evicting the oldest entry if full."""
+        self._user_cache[user_id] = (time.monotonic() + USER_CACHE_TTL, user_data)
+        self._user_cache.move_to_end(user_id)
+        if len(self._user_cache) > USER_CACHE_SIZE:
+            self._user_cache.popitem(last=False)
+
+    def _mark_user_written(self, user_id: int) -> None:
+        """Record a DOB write so overlapping reads do not cache the old row."""
+        self._write_seq += 1
+        self._user_writes[user_id] = self._write_seq
+        self._user_writes.move_to_end(user_id)
+        if len(self._user_writes) > USER_CACHE_SIZE:
+            self._user_writes.popitem(last=False)
+
+    def _cached_user(self, user_id: int) -> Optional[Tuple[date, str, int]]:
+        """Return a fresh cached profile, dropping it if it has expired."""
+        cached = self._user_cache.get(user_id)
+        if cached is None:
+            return None
+
+        expires_at, user_data = cached
+        if time.monotonic() < expires_at:
+            self._user_cache.move_to_end(user_id)
+            return user_data
+        # Expired; re-read so changes made outside this process show up
+        del self._user_cache[user_id]
+        return None
+
+    def _load_user(self, user_id: int, row: Optional[Tuple[str, str, int]],
+                   write_stamp: Optional[int]) -> Optional[Tuple[date, str, int]]:
+        """
+        Convert a database row to cached profile form and remember it.
+
+        write_stamp is the user's _user_writes entry taken before the row was
+        read; if a save has happened since, the row may be stale and is
+        returned without being cached.
+        """
+        if not row:
+            return None
+
+        dob_str, zodiac, life_path = row
+        user_data = (date.fromisoformat(dob_str), zodiac, life_path)
+        if self._user_writes.get(user_id) == write_stamp:
+            self._remember_user(user_id, user_data)
+        return user_data
+
+    async def get_user_data(self, user_id: int) -> Optional[Tuple[date, str, int]]:
+        """
+        Get user's data, serving repeat lookups within USER_CACHE_TTL from memory.
+
+        The stored DOB string is parsed once when the profile is loaded.
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            Optional[Tuple]: (birth_date, zodiac_sign, life_path_number) or None
+        """
+        user_data = self._cached_user(user_id)
+        if user_data is not None:
+            return user_data
+
+        write_stamp = self._user_writes.get(user_id)
+        row = await self.run_db(self.db.get_user_data, user_id)
+        return self._load_user(user_id, row, write_stamp)
+
+    async def get_user_data_and_fact(
+        self, user_id: int
+    ) -> Tuple[Optional[Tuple[date, str, int]], Optional[Tuple[str, str]]]:
+        """
+        Get user's data together with a random fact.
+
+        A cached profile only needs the fact from the database; otherwise both
+        are read in a single worker-thread job.
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            Tuple: (user data as from get_user_data, (fact_text, fact_type) or None)
+        """
+        user_data = self._cached_user(user_id)
+        if user_data is not None:
+            return user_data, await self.run_db(self.db.get_random_fact)
+
+        write_stamp = self._user_writes.get(user_id)
+        row, fact = await self.run_db(self.db.get_user_and_random_fact, user_id)
+        return self._load_user(user_id, row, write_stamp), fact
+
+    async def save_user_dob(self, user_id: int, birth_date: date, zodiac: str,
+                            life_path: int) -> Optional[Tuple[date, str, int]]:
+        """
+        Persist a user's birth date and keep the profile cache coherent.
+
+        Args:
+            user_id: Telegram user ID
+            birth_date: User's birth date
+            zodiac: Zodiac sign
+            life_path: Life path number
+
+        Returns:
+            Optional[Tuple]: The stored (birth_date, zodiac_sign, life_path_number), or None on failure
+        """
+        saved = await self.run_db(self.db.save_user_dob, user_id, birth_date, zodiac, life_path)
+        # Marked whether or not the write succeeded: reads that overlapped it
+        # may have seen either version of the row
+        self._mark_user_written(user_id)
+
+        if saved and self.config.verify_writes:
+            # Debugging aid: confirm the row really reads back as written
+            stored = await self.run_db(self.db.get_user_data, user_id)
+            if stored != saved:
+                logger.error("Write verification failed for user %s: %s != %s", user_id, stored, saved)
+                saved = None
+
+        if not saved:
+            self._user_cache.pop(user_id, None)
+            return None
+
+        user_data = (birth_date, zodiac, life_path)
+        self._remember_user(user_id, user_data)
+        self._stats_cache = None  # user counts and distribution may have changed
+        return user_data
+
+    async def get_database_stats(self) -> Dict[str, Any]:
+        """
+        Get database statistics, reusing the last result for STATS_CACHE_TTL.
+
+        Returns:
+            Dict: Statistics dictionary
+        """
+        now = time.monotonic()
+        if self._stats_cache is not None and now < self._stats_cache[0]:
+            return self._stats_cache[1]
+
+        stats = await self.run_db(self.db.get_database_stats)
+        if stats:
+            self._stats_cache = (now + STATS_CACHE_TTL, stats)
+        return stats
 
     def is_admin(self, user_id: int) -> bool:
         """
@@ -128,7 +604,7 @@ class AstrologyBot:
         Returns:
             bool: True if user is admin
         """
-        return user_id in self.config.admin_ids
+        return user_id in self._admin_ids
 
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
@@ -138,28 +614,29 @@ class AstrologyBot:
             update: Telegram update object
             context: Handler context
         """
-        self.metrics.increment_errors()
-        logger.error("Exception while handling update:", exc_info=context.error)
+        self.metrics.total_errors += 1
+
+        # Identify the update by id and user only; repr() of a whole Update is costly
+        is_update = isinstance(update, Update)
+        logger.error(
+            "Exception while handling update %s (user %s):",
+            update.update_id if is_update else None,
+            update.effective_user.id if is_update and update.effective_user else None,
+            exc_info=context.error
+        )
 
         # Determine error message based on error type
-        error_message = "Sorry, something went wrong. Please try again."
-
-        if isinstance(context.error, NetworkError):
-            error_message = "Network error. Please check your connection and try again."
-        elif isinstance(context.error, TimedOut):
-            error_message = "Request timed out. Please try again."
-        elif isinstance(context.error, BadRequest):
-            error_message = "Invalid request. Please check your input."
+        error_message = _error_message_for(context.error)
 
         # Try to send error message to user
         try:
-            if update and isinstance(update, Update) and update.effective_message:
+            if is_update and update.effective_message:
                 await update.effective_message.reply_text(
                     f"❌ {error_message}",
-                    reply_markup=self.get_main_keyboard()
+                    reply_markup=self._main_keyboard
                 )
         except Exception as e:
-            logger.error(f"Could not send error message to user: {e}")
+            logger.error("Could not send error message to user: %s", e)
 
     def setup_application(self) -> Application:
         """
@@ -176,14 +653,35 @@ class AstrologyBot:
 
             builder = Application.builder()
             builder.token(self.config.token)
-            builder.connection_pool_size(self.config.connection_pool_size)
-            builder.read_timeout(self.config.request_timeout)
-            builder.write_timeout(self.config.request_timeout)
-            builder.connect_timeout(self.config.request_timeout)
+            # httpx keeps every pooled connection alive between requests, so the
+            # pool size is also how many replies can go out without a new handshake.
+            # A broadcast batch holds up to BROADCAST_RATE connections at once, so
+            # reserve that many on top so regular replies never wait on the pool.
+            pool_size = self.config.connection_pool_size
+            if self.config.broadcast_enabled:
+                pool_size += BROADCAST_RATE
+            builder.request(KeepAliveHTTPXRequest(
+                connection_pool_size=pool_size,
+                pool_timeout=self.config.pool_timeout,
+                http_version=self.config.http_version,
+                read_timeout=self.config.request_timeout,
+                write_timeout=self.config.request_timeout,
+                connect_timeout=self.config.request_timeout,
+            ))
+
+            # Long polling keeps its own single connection alive between calls
+            builder.get_updates_request(KeepAliveHTTPXRequest(
+                pool_timeout=self.config.pool_timeout,
+                http_version=self.config.http_version,
+                connect_timeout=self.config.request_timeout,
+            ))
 
             application = builder.build()
             application.add_error_handler(self.error_handler)
 
+            # Handlers reach the shared keyboard through context.bot_data
+            application.bot_data[MAIN_KEYBOARD_KEY] = self._main_keyboard
+
             self.application = application
             self.state = BotState.RUNNING
 
@@ -192,13 +690,43 @@ class AstrologyBot:
 
         except Exception as e:
             self.state = BotState.ERROR
-            logger.error(f"Application setup failed: {e}")
+            logger.error("Application setup failed: %s", e)
             raise
 
 
+def _install_gc_monitor() -> None:
+    """Log the duration of every garbage collection pass (debug aid)."""
+    started = [0.0]
+
+    def on_gc(phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            logger.debug(
+                "GC gen%s: %.2f ms, %s collected",
+                info["generation"], (time.perf_counter() - started[0]) * 1000, info["collected"]
+            )
+
+    gc.callbacks.append(on_gc)
+
+
+# Per-user conversation keys stored in context.user_data
+_SESSION_KEYS = ('dob_day', 'dob_month', 'compatibility_check')
+
+
+def _reset_session(user_data: Dict[str, Any]) -> None:
+    """Drop this bot's conversation keys without rebuilding the whole dict."""
+    for key in _SESSION_KEYS:
+        user_data.pop(key, None)
+
+
 # Global bot instance
 bot: Optional[AstrologyBot] = None
 
+# Direct references to the bot's hot members, bound once in main()
+_astro: Optional[AstrologyCalculator] = None
+_metrics: Optional[BotMetrics] = None
+
 
 async def safe_reply(update: Update, message: str, keyboard=None) -> bool:
     """
@@ -212,17 +740,62 @@ async def safe_reply(update: Update, message: str, keyboard=None) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    try:
-        if update and update.effective_message:
-            reply_markup = keyboard if keyboard is not None else bot.get_main_keyboard()
-            await update.effective_message.reply_text(message, reply_markup=reply_markup)
-            return True
+    if not update or not update.effective_message:
         return False
+
+    reply_markup = keyboard if keyboard is not None else bot._main_keyboard
+    try:
+        await update.effective_message.reply_text(message, reply_markup=reply_markup)
     except Exception as e:
-        logger.error(f"Failed to send reply: {e}")
+        logger.error("Failed to send reply: %s", e)
         return False
+    return True
+
+
+def telegram_handler(fallback_msg: str, fallback_state: Optional[int] = None):
+    """
+    Wrap a handler so unexpected errors are logged and answered with a fallback.
 
+    Args:
+        fallback_msg: Reply sent to the user when the handler fails
+        fallback_state: Conversation state to return on failure, if any
+
+    Returns:
+        Callable: Decorator applied to an async handler
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            try:
+                return await func(update, context)
+            except Exception as e:
+                logger.error("Error in %s: %s", func.__name__, e)
+                await safe_reply(update, fallback_msg)
+                return fallback_state
+        return wrapper
+    return decorator
+
+
+def admin_only(func):
+    """
+    Run the wrapped handler only for configured admins; ignore everyone else.
+
+    Args:
+        func: Async handler to protect
 
+    Returns:
+        Callable: Wrapped handler
+    """
+    @functools.wraps(func)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        if user is None or not bot.is_admin(user.id):
+            return None
+        return await func(update, context)
+    return wrapper
+
+
+@telegram_handler("Welcome! Use the menu to explore features.")
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle /start command with welcoming message.
@@ -231,34 +804,22 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
-
-        user_id = update.effective_user.id
-        first_name = update.effective_user.first_name or "User"
-        bot.metrics.increment_commands()
+    if not update.effective_user or not update.message:
+        return
 
-        logger.info(f"User {user_id} ({first_name}) started the bot")
+    user_id = update.effective_user.id
+    first_name = update.effective_user.first_name or "User"
+    _metrics.total_commands += 1
 
-        welcome_msg = f"🌟 Welcome {first_name}! I'm your astrology companion.\n\n"
-        welcome_msg += "✨ **What I can help you with:**\n"
-        welcome_msg += "• Daily horoscopes and personalized readings\n"
-        welcome_msg += "• Numerology and life path analysis\n"
-        welcome_msg += "• Zodiac compatibility checks\n"
-        welcome_msg += "• Lucky numbers and cosmic insights\n\n"
-        welcome_msg += "👉 Use the menu below to get started!"
-
-        await update.message.reply_text(
-            welcome_msg,
-            reply_markup=bot.get_main_keyboard()
-        )
+    logger.info("User %s (%s) started the bot", user_id, first_name)
 
-    except Exception as e:
-        logger.error(f"Error in start command: {e}")
-        await safe_reply(update, "Welcome! Use the menu to explore features.")
+    await update.message.reply_text(
+        _WELCOME_TEMPLATE.format(name=first_name),
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+    )
 
 
+@telegram_handler("Help is available via the menu buttons.")
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle /help command with detailed feature information.
@@ -267,36 +828,19 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
+    if not update.effective_user or not update.message:
+        return
 
-        bot.metrics.increment_commands()
-
-        help_text = "📚 **Available Features**\n\n"
-        help_text += "🎂 **Set DOB** - Configure your birth date for personalized readings\n"
-        help_text += "🔮 **Today's Reading** - Get your daily horoscope\n"
-        help_text += "🔢 **Numerology** - Discover your life path number\n"
-        help_text += "💕 **Compatibility** - Check relationship compatibility\n"
-        help_text += "✨ **Zodiac Secret** - Random cosmic insights\n\n"
-        help_text += "📋 **Commands:**\n"
-        help_text += "`/setdob` - Set your birth date\n"
-        help_text += "`/today` - Get daily reading\n"
-        help_text += "`/numerology` - View numerology info\n"
-        help_text += "`/compatibility` - Check compatibility\n"
-        help_text += "`/help` - Show this help message"
+    _metrics.total_commands += 1
 
-        await update.message.reply_text(
-            help_text,
-            reply_markup=bot.get_main_keyboard(),
-            parse_mode='Markdown'
-        )
-
-    except Exception as e:
-        logger.error(f"Error in help command: {e}")
-        await safe_reply(update, "Help is available via the menu buttons.")
+    await update.message.reply_text(
+        _HELP_TEXT,
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY],
+        entities=_HELP_ENTITIES
+    )
 
 
+@telegram_handler("Please enter the day (1-31):", SET_DOB_DAY)
 async def start_set_dob(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Start date of birth conversation flow.
@@ -308,29 +852,20 @@ async def start_set_dob(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     Returns:
         int: Next conversation state
     """
-    try:
-        if not update.effective_user or not update.message:
-            return ConversationHandler.END
-
-        bot.metrics.increment_commands()
-        context.user_data.clear()
+    if not update.effective_user or not update.message:
+        return ConversationHandler.END
 
-        msg = "🎂 **Let's set your birth date!**\n\n"
-        msg += "Please enter the **DAY** of your birth (1-31):"
+    _metrics.total_commands += 1
+    _reset_session(context.user_data)
 
-        await update.message.reply_text(
-            msg,
-            reply_markup=ReplyKeyboardRemove(),
-            parse_mode='Markdown'
-        )
-        return SET_DOB_DAY
-
-    except Exception as e:
-        logger.error(f"Error starting DOB conversation: {e}")
-        await safe_reply(update, "Please enter the day (1-31):")
-        return SET_DOB_DAY
+    await update.message.reply_text(
+        _SET_DOB_PROMPT,
+        reply_markup=ReplyKeyboardRemove()
+    )
+    return SET_DOB_DAY
 
 
+@telegram_handler("Please enter a valid day (1-31):", SET_DOB_DAY)
 async def set_dob_day(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle day input in DOB conversation.
@@ -342,40 +877,31 @@ async def set_dob_day(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     Returns:
         int: Next conversation state
     """
-    try:
-        if not update.effective_user or not update.message:
-            return ConversationHandler.END
-
-        day_text = update.message.text.strip()
-
-        # Validate input
-        if not day_text.isdigit() or len(day_text) > 2:
-            await update.message.reply_text(
-                "❌ Please enter a valid day number (1-31):"
-            )
-            return SET_DOB_DAY
+    if not update.effective_user or not update.message:
+        return ConversationHandler.END
 
-        day = int(day_text)
-        if not (1 <= day <= 31):
-            await update.message.reply_text(
-                "❌ Day must be between 1 and 31.\n\nPlease try again:"
-            )
-            return SET_DOB_DAY
+    day_text = update.message.text.strip()
 
-        context.user_data['dob_day'] = day
+    # Validate input
+    day = _DAY_LOOKUP.get(day_text)
+    if day is None:
+        await update.message.reply_text(
+            "❌ Please enter a valid day number (1-31):"
+        )
+        return SET_DOB_DAY
 
-        msg = f"✅ Day: **{day}**\n\n"
-        msg += "Now enter the **MONTH** (1-12 or name like 'January'):"
+    context.user_data['dob_day'] = day
 
-        await update.message.reply_text(msg, parse_mode='Markdown')
-        return SET_DOB_MONTH
+    msg = (
+        f"✅ Day: {day}\n\n"
+        "Now enter the MONTH (1-12 or name like 'January'):"
+    )
 
-    except Exception as e:
-        logger.error(f"Error in set_dob_day: {e}")
-        await safe_reply(update, "Please enter a valid day (1-31):")
-        return SET_DOB_DAY
+    await update.message.reply_text(msg)
+    return SET_DOB_MONTH
 
 
+@telegram_handler("Please enter a valid month:", SET_DOB_MONTH)
 async def set_dob_month(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle month input in DOB conversation.
@@ -387,54 +913,29 @@ async def set_dob_month(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     Returns:
         int: Next conversation state
     """
-    try:
-        if not update.effective_user or not update.message:
-            return ConversationHandler.END
-
-        month_text = update.message.text.strip().lower()
-        month = None
-
-        # Try numeric input
-        if month_text.isdigit():
-            month_num = int(month_text)
-            if 1 <= month_num <= 12:
-                month = month_num
-
-        # Try month name
-        if month is None:
-            month_names = {
-                'january': 1, 'jan': 1, 'february': 2, 'feb': 2,
-                'march': 3, 'mar': 3, 'april': 4, 'apr': 4,
-                'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-                'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-                'october': 10, 'oct': 10, 'november': 11, 'nov': 11,
-                'december': 12, 'dec': 12
-            }
-            month = month_names.get(month_text)
-
-        if month is None:
-            await update.message.reply_text(
-                "❌ Please enter a valid month (1-12 or name like 'January'):"
-            )
-            return SET_DOB_MONTH
+    if not update.effective_user or not update.message:
+        return ConversationHandler.END
 
-        context.user_data['dob_month'] = month
+    month = _MONTH_LOOKUP.get(update.message.text.strip().lower())
+    if month is None:
+        await update.message.reply_text(
+            "❌ Please enter a valid month (1-12 or name like 'January'):"
+        )
+        return SET_DOB_MONTH
 
-        import calendar
-        month_name = calendar.month_name[month]
-        day = context.user_data.get('dob_day', '?')
+    context.user_data['dob_month'] = month
 
-        msg = f"✅ Day: **{day}**\n"
-        msg += f"✅ Month: **{month_name}**\n\n"
-        msg += "Finally, enter your birth **YEAR** (e.g., 1990):"
+    month_name = _MONTH_DISPLAY[month]
+    day = context.user_data.get('dob_day', '?')
 
-        await update.message.reply_text(msg, parse_mode='Markdown')
-        return SET_DOB_YEAR
+    msg = (
+        f"✅ Day: {day}\n"
+        f"✅ Month: {month_name}\n\n"
+        "Finally, enter your birth YEAR (e.g., 1990):"
+    )
 
-    except Exception as e:
-        logger.error(f"Error in set_dob_month: {e}")
-        await safe_reply(update, "Please enter a valid month:")
-        return SET_DOB_MONTH
+    await update.message.reply_text(msg)
+    return SET_DOB_YEAR
 
 
 async def set_dob_year(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -456,7 +957,7 @@ async def set_dob_year(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         year_text = update.message.text.strip()
 
         # Validate year format
-        if not year_text.isdigit() or len(year_text) != 4:
+        if not _YEAR_RE.fullmatch(year_text):
             await update.message.reply_text(
                 "❌ Please enter a valid 4-digit year (e.g., 1990):"
             )
@@ -470,82 +971,78 @@ async def set_dob_year(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         if not day or not month:
             await update.message.reply_text(
                 "⚠️ Session expired. Please start over with /setdob",
-                reply_markup=bot.get_main_keyboard()
+                reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
             )
-            context.user_data.clear()
+            _reset_session(context.user_data)
             return ConversationHandler.END
 
-        logger.info(f"User {user_id} entered DOB: {day}/{month}/{year}")
+        logger.info("User %s entered DOB: %s/%s/%s", user_id, day, month, year)
 
         # Validate and create birth date
         try:
-            birth_date = bot.astro.validate_birth_date(day, month, year)
-            logger.info(f"Birth date validated: {birth_date}")
+            birth_date = _astro.validate_birth_date(day, month, year)
+            logger.info("Birth date validated: %s", birth_date)
         except ValueError as e:
-            logger.warning(f"Invalid birth date for user {user_id}: {e}")
+            logger.warning("Invalid birth date for user %s: %s", user_id, e)
             await update.message.reply_text(
                 f"❌ Error: {e}\n\nPlease enter the year again:"
             )
             return SET_DOB_YEAR
 
         # Calculate zodiac and life path
-        zodiac = bot.astro.get_zodiac_sign(birth_date)
-        life_path = bot.astro.calculate_life_path(birth_date)
+        zodiac = _astro.get_zodiac_sign(birth_date)
+        life_path = _astro.calculate_life_path(birth_date)
 
-        logger.info(f"Calculated - Zodiac: {zodiac}, Life Path: {life_path}")
+        logger.info("Calculated - Zodiac: %s, Life Path: %s", zodiac, life_path)
 
-        # Save to database with verification
-        logger.info(f"Saving to database for user {user_id}...")
-        save_result = bot.db.save_user_dob(user_id, birth_date, zodiac, life_path)
+        # Save to database
+        logger.info("Saving to database for user %s...", user_id)
+        save_result = await bot.save_user_dob(user_id, birth_date, zodiac, life_path)
 
         if save_result:
-            # Double-verify the save
-            verify_data = bot.db.get_user_data(user_id)
-
-            if verify_data:
-                success_msg = "🎉 **Birth date saved successfully!**\n\n"
-                success_msg += f"📅 **Date:** {birth_date.strftime('%B %d, %Y')}\n"
-                success_msg += f"♈ **Zodiac Sign:** {zodiac}\n"
-                success_msg += f"🔢 **Life Path Number:** {life_path}\n\n"
-                success_msg += "✨ You can now use all features!\n"
-                success_msg += "Try 'Today's Reading' for your daily horoscope."
-
-                await update.message.reply_text(
-                    success_msg,
-                    reply_markup=bot.get_main_keyboard(),
-                    parse_mode='Markdown'
-                )
-                logger.info(f"✓ Successfully saved and verified DOB for user {user_id}")
-            else:
-                raise Exception("Data saved but verification failed")
+            success_msg = (
+                "🎉 Birth date saved successfully!\n\n"
+                f"📅 Date: {_format_long_date(birth_date)}\n"
+                f"♈ Zodiac Sign: {zodiac}\n"
+                f"🔢 Life Path Number: {life_path}\n\n"
+                "✨ You can now use all features!\n"
+                "Try 'Today's Reading' for your daily horoscope."
+            )
+
+            await update.message.reply_text(
+                success_msg,
+                reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+            )
+            logger.info("✓ Successfully saved DOB for user %s", user_id)
         else:
-            error_msg = "❌ **Failed to save your birth date.**\n\n"
-            error_msg += "This might be a temporary issue. Please try again later.\n"
-            error_msg += "If the problem persists, contact support."
+            error_msg = (
+                "❌ Failed to save your birth date.\n\n"
+                "This might be a temporary issue. Please try again later.\n"
+                "If the problem persists, contact support."
+            )
 
             await update.message.reply_text(
                 error_msg,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
+                reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
             )
-            logger.error(f"✗ Failed to save DOB for user {user_id}")
+            logger.error("✗ Failed to save DOB for user %s", user_id)
 
-        context.user_data.clear()
+        _reset_session(context.user_data)
         return ConversationHandler.END
 
     except ValueError as e:
-        logger.error(f"Value error in set_dob_year: {e}")
+        logger.error("Value error in set_dob_year: %s", e)
         await update.message.reply_text(
             f"❌ Error: {e}\n\nPlease enter the year again:"
         )
         return SET_DOB_YEAR
     except Exception as e:
-        logger.error(f"Unexpected error in set_dob_year: {e}", exc_info=True)
+        logger.error("Unexpected error in set_dob_year: %s", e, exc_info=True)
         await update.message.reply_text(
             "❌ An unexpected error occurred.\n\nPlease try /setdob again.",
-            reply_markup=bot.get_main_keyboard()
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
         )
-        context.user_data.clear()
+        _reset_session(context.user_data)
         return ConversationHandler.END
 
 
@@ -561,18 +1058,19 @@ async def cancel_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE
         int: ConversationHandler.END
     """
     try:
-        context.user_data.clear()
+        _reset_session(context.user_data)
         await update.message.reply_text(
             "❌ Operation cancelled!\n\nYou can start again anytime.",
-            reply_markup=bot.get_main_keyboard()
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
         )
-        logger.info(f"User {update.effective_user.id} cancelled conversation")
+        logger.info("User %s cancelled conversation", update.effective_user.id)
         return ConversationHandler.END
     except Exception as e:
-        logger.error(f"Error in cancel_conversation: {e}")
+        logger.error("Error in cancel_conversation: %s", e)
         return ConversationHandler.END
 
 
+@telegram_handler("❌ Couldn't generate your reading. Please try again.")
 async def today_reading(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Generate and send today's personalized reading.
@@ -581,52 +1079,45 @@ async def today_reading(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
+    if not update.effective_user or not update.message:
+        return
 
-        user_id = update.effective_user.id
-        bot.metrics.increment_commands()
+    user_id = update.effective_user.id
+    _metrics.total_commands += 1
 
-        user_data = bot.db.get_user_data(user_id)
+    user_data, fact_result = await bot.get_user_data_and_fact(user_id)
 
-        if not user_data:
-            msg = "⚠️ **Please set your birth date first!**\n\n"
-            msg += "Use the 'Set DOB' button below to get started."
-            await update.message.reply_text(
-                msg,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
-            )
-            return
-
-        dob_str, zodiac, life_path = user_data
+    if not user_data:
+        await update.message.reply_text(
+            _DOB_REQUIRED_READING,
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+        )
+        return
 
-        # Generate reading components
-        horoscope = bot.astro.get_horoscope(zodiac)
-        lucky_number = bot.astro.generate_lucky_number(life_path, date.today())
+    _, zodiac, life_path = user_data
 
-        fact_result = bot.db.get_random_fact()
-        fact = fact_result[0] if fact_result else "Believe in yourself and trust the journey!"
+    # Generate reading components
+    horoscope = _astro.get_horoscope(zodiac)
+    lucky_number = _astro.generate_lucky_number(life_path, date.today())
 
-        reading = f"🔮 **Today's Reading for {zodiac}**\n\n"
-        reading += f"📜 **Horoscope:**\n{horoscope}\n\n"
-        reading += f"🍀 **Lucky Number:** {lucky_number}\n\n"
-        reading += f"💫 **Daily Insight:**\n{fact}"
+    fact = fact_result[0] if fact_result else "Believe in yourself and trust the journey!"
 
-        await update.message.reply_text(
-            reading,
-            reply_markup=bot.get_main_keyboard(),
-            parse_mode='Markdown'
-        )
+    reading = (
+        f"🔮 Today's Reading for {zodiac}\n\n"
+        f"📜 Horoscope:\n{horoscope}\n\n"
+        f"🍀 Lucky Number: {lucky_number}\n\n"
+        f"💫 Daily Insight:\n{fact}"
+    )
 
-        logger.info(f"Generated daily reading for user {user_id} ({zodiac})")
+    await update.message.reply_text(
+        reading,
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+    )
 
-    except Exception as e:
-        logger.error(f"Error in today_reading: {e}")
-        await safe_reply(update, "❌ Couldn't generate your reading. Please try again.")
+    logger.info("Generated daily reading for user %s (%s)", user_id, zodiac)
 
 
+@telegram_handler("❌ Couldn't retrieve numerology information.")
 async def numerology_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Display numerology information and life path analysis.
@@ -635,50 +1126,38 @@ async def numerology_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
-
-        user_id = update.effective_user.id
-        bot.metrics.increment_commands()
+    if not update.effective_user or not update.message:
+        return
 
-        user_data = bot.db.get_user_data(user_id)
+    user_id = update.effective_user.id
+    _metrics.total_commands += 1
 
-        if not user_data:
-            msg = "⚠️ **Please set your birth date first!**\n\n"
-            msg += "Use the 'Set DOB' button to unlock numerology insights."
-            await update.message.reply_text(
-                msg,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
-            )
-            return
-
-        dob_str, zodiac, life_path = user_data
-        birth_date = datetime.fromisoformat(dob_str).date()
-
-        # Get numerology details
-        calculation = bot.astro.get_life_path_calculation_steps(birth_date)
-        meaning = bot.astro.get_life_path_meaning(life_path)
-
-        numerology_text = f"🔢 **Your Numerology Profile**\n\n"
-        numerology_text += f"**Life Path Number:** {life_path}\n\n"
-        numerology_text += f"📊 **Calculation:**\n{calculation}\n\n"
-        numerology_text += f"✨ **Meaning:**\n{meaning}"
+    user_data = await bot.get_user_data(user_id)
 
+    if not user_data:
         await update.message.reply_text(
-            numerology_text,
-            reply_markup=bot.get_main_keyboard(),
-            parse_mode='Markdown'
+            _DOB_REQUIRED_NUMEROLOGY,
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
         )
+        return
 
-        logger.info(f"Displayed numerology info for user {user_id} (Life Path {life_path})")
+    birth_date, zodiac, life_path = user_data
 
-    except Exception as e:
-        logger.error(f"Error in numerology_info: {e}")
-        await safe_reply(update, "❌ Couldn't retrieve numerology information.")
+    # Get numerology details
+    calculation = _astro.get_life_path_calculation_steps(birth_date)
+    meaning = _astro.get_life_path_meaning(life_path)
+
+    await update.message.reply_text(
+        _NUMEROLOGY_TEMPLATE.format(
+            life_path=life_path, calculation=calculation, meaning=meaning
+        ),
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+    )
+
+    logger.info("Displayed numerology info for user %s (Life Path %s)", user_id, life_path)
 
 
+@telegram_handler("✨ Here's a secret: You're awesome!")
 async def zodiac_secret(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Share a random zodiac secret or interesting fact.
@@ -687,42 +1166,29 @@ async def zodiac_secret(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
-
-        bot.metrics.increment_commands()
-        fact_result = bot.db.get_random_fact()
+    if not update.effective_user or not update.message:
+        return
 
-        if fact_result:
-            fact_text, fact_type = fact_result
+    _metrics.total_commands += 1
+    fact_result = await bot.run_db(bot.db.get_random_fact)
 
-            emoji_map = {
-                "psychology": "🧠",
-                "science": "🔬",
-                "numerology": "🔢",
-                "astrology": "⭐",
-                "general": "💡"
-            }
-            emoji = emoji_map.get(fact_type, "🎲")
+    if fact_result:
+        fact_text, fact_type = fact_result
+        emoji = _FACT_EMOJI.get(fact_type, _DEFAULT_FACT_EMOJI)
 
-            msg = f"✨ **Zodiac Secret**\n\n{emoji} {fact_text}"
-            await update.message.reply_text(
-                msg,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
-            )
-        else:
-            await update.message.reply_text(
-                "✨ The universe is full of mysteries waiting to be discovered!",
-                reply_markup=bot.get_main_keyboard()
-            )
-
-    except Exception as e:
-        logger.error(f"Error in zodiac_secret: {e}")
-        await safe_reply(update, "✨ Here's a secret: You're awesome!")
+        msg = f"✨ Zodiac Secret\n\n{emoji} {fact_text}"
+        await update.message.reply_text(
+            msg,
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+        )
+    else:
+        await update.message.reply_text(
+            "✨ The universe is full of mysteries waiting to be discovered!",
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+        )
 
 
+@telegram_handler("❌ Couldn't start compatibility check.")
 async def compatibility_check(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Start compatibility check process.
@@ -731,48 +1197,34 @@ async def compatibility_check(update: Update, context: ContextTypes.DEFAULT_TYPE
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
-
-        user_id = update.effective_user.id
-        bot.metrics.increment_commands()
-
-        user_data = bot.db.get_user_data(user_id)
-
-        if not user_data:
-            msg = "⚠️ **Please set your birth date first!**\n\n"
-            msg += "You need to set your DOB before checking compatibility."
-            await update.message.reply_text(
-                msg,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
-            )
-            return
+    if not update.effective_user or not update.message:
+        return
 
-        dob_str, user_zodiac, user_life_path = user_data
+    user_id = update.effective_user.id
+    _metrics.total_commands += 1
 
-        # Store user data for compatibility calculation
-        context.user_data['compatibility_check'] = {
-            'user_zodiac': user_zodiac,
-            'user_life_path': user_life_path
-        }
-
-        check_msg = f"💕 **Compatibility Check**\n\n"
-        check_msg += f"**Your Sign:** {user_zodiac}\n"
-        check_msg += f"**Your Life Path:** {user_life_path}\n\n"
-        check_msg += "📅 Now, send your partner's birth date in this format:\n"
-        check_msg += "`DD-MM-YYYY` (e.g., 15-06-1995)"
+    user_data = await bot.get_user_data(user_id)
 
+    if not user_data:
         await update.message.reply_text(
-            check_msg,
-            reply_markup=ReplyKeyboardRemove(),
-            parse_mode='Markdown'
+            _DOB_REQUIRED_COMPATIBILITY,
+            reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
         )
+        return
 
-    except Exception as e:
-        logger.error(f"Error in compatibility_check: {e}")
-        await safe_reply(update, "❌ Couldn't start compatibility check.")
+    _, user_zodiac, user_life_path = user_data
+
+    # Store user data for compatibility calculation
+    context.user_data['compatibility_check'] = {
+        'user_zodiac': user_zodiac,
+        'user_life_path': user_life_path
+    }
+
+    await update.message.reply_text(
+        _COMPATIBILITY_PROMPT_TEMPLATE.format(zodiac=user_zodiac, life_path=user_life_path),
+        reply_markup=ReplyKeyboardRemove(),
+        parse_mode='Markdown'
+    )
 
 
 async def process_compatibility_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -787,13 +1239,18 @@ async def process_compatibility_date(update: Update, context: ContextTypes.DEFAU
         if 'compatibility_check' not in context.user_data:
             return
 
-        date_text = update.message.text.strip()
+        date_match = _COMPAT_DATE_RE.match(update.message.text.strip())
 
         try:
-            # Parse partner's birth date
-            other_date = bot.astro.parse_date_input(date_text)
-            other_zodiac = bot.astro.get_zodiac_sign(other_date)
-            other_life_path = bot.astro.calculate_life_path(other_date)
+            if not date_match:
+                raise ValueError("Use DD-MM-YYYY format")
+
+            # Parse partner's birth date; the filter already guarantees the shape
+            other_date = _astro.validate_birth_date(
+                int(date_match['day']), int(date_match['month']), int(date_match['year'])
+            )
+            other_zodiac = _astro.get_zodiac_sign(other_date)
+            other_life_path = _astro.calculate_life_path(other_date)
 
             # Get user data
             user_data = context.user_data['compatibility_check']
@@ -802,44 +1259,66 @@ async def process_compatibility_date(update: Update, context: ContextTypes.DEFAU
 
             # Calculate compatibility
             zodiac_score, numerology_score, overall_score, compatibility_level = \
-                bot.astro.calculate_compatibility(
+                _astro.calculate_compatibility(
                     user_zodiac, user_life_path,
                     other_zodiac, other_life_path
                 )
 
             # Get elements for additional context
-            user_element = bot.astro.get_element(user_zodiac)
-            other_element = bot.astro.get_element(other_zodiac)
-
-            result = f"💕 **Compatibility Analysis**\n\n"
-            result += f"**You:** {user_zodiac} ({user_element}) - Path {user_life_path}\n"
-            result += f"**Partner:** {other_zodiac} ({other_element}) - Path {other_life_path}\n\n"
-            result += f"⭐ **Zodiac Compatibility:** {zodiac_score}%\n"
-            result += f"🔢 **Numerology Harmony:** {numerology_score}%\n\n"
-            result += f"💫 **Overall Match:** {overall_score}% - **{compatibility_level}**"
+            user_element = _astro.get_element(user_zodiac)
+            other_element = _astro.get_element(other_zodiac)
+
+            result = (
+                "💕 Compatibility Analysis\n\n"
+                f"You: {user_zodiac} ({user_element}) - Path {user_life_path}\n"
+                f"Partner: {other_zodiac} ({other_element}) - Path {other_life_path}\n\n"
+                f"⭐ Zodiac Compatibility: {zodiac_score}%\n"
+                f"🔢 Numerology Harmony: {numerology_score}%\n\n"
+                f"💫 Overall Match: {overall_score}% - {compatibility_level}"
+            )
 
             await update.message.reply_text(
                 result,
-                reply_markup=bot.get_main_keyboard(),
-                parse_mode='Markdown'
+                reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
             )
 
             # Clear compatibility data
             context.user_data.pop('compatibility_check', None)
 
-            logger.info(f"Compatibility check: {user_zodiac} + {other_zodiac} = {overall_score}%")
+            logger.info("Compatibility check: %s + %s = %s%%", user_zodiac, other_zodiac, overall_score)
 
         except ValueError as e:
             await update.message.reply_text(
-                f"❌ **Invalid date:** {e}\n\nPlease use DD-MM-YYYY format (e.g., 15-06-1995):"
+                f"❌ Invalid date: {e}\n\nPlease use DD-MM-YYYY format (e.g., 15-06-1995):"
             )
 
     except Exception as e:
-        logger.error(f"Error processing compatibility: {e}")
+        logger.error("Error processing compatibility: %s", e)
         await safe_reply(update, "❌ Couldn't process date. Please use DD-MM-YYYY format.")
         context.user_data.pop('compatibility_check', None)
 
 
+_TEXT_ROUTES = {
+    'today': today_reading,
+    'numerology': numerology_info,
+    'secret': zodiac_secret,
+    'compatibility': compatibility_check,
+    'help': help_command,
+}
+
+# Menu buttons send their exact label; resolve those with one dict lookup.
+# Built through the router so buttons and typed text always agree.
+_BUTTON_ROUTES = {
+    label: _TEXT_ROUTES[route.lastgroup]
+    for label, route in (
+        (label, _TEXT_ROUTER_RE.match(label.lower()))
+        for row in MAIN_KEYBOARD for label in row
+    )
+    if route
+}
+
+
+@telegram_handler("Use the menu buttons to interact with the bot!")
 async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle general text messages and route to appropriate handlers.
@@ -848,40 +1327,33 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
+    if not update.effective_user or not update.message:
+        return
 
-        text = update.message.text.lower().strip()
-
-        # Route based on message content
-        if any(phrase in text for phrase in ["set dob", "birth", "birthday", "date of birth"]):
-            return await start_set_dob(update, context)
-        elif any(phrase in text for phrase in ["today", "reading", "horoscope", "daily"]):
-            return await today_reading(update, context)
-        elif "numerology" in text or "life path" in text:
-            return await numerology_info(update, context)
-        elif any(phrase in text for phrase in ["fact", "secret", "insight"]):
-            return await zodiac_secret(update, context)
-        elif "compatibility" in text or "match" in text:
-            return await compatibility_check(update, context)
-        elif "help" in text or "commands" in text:
-            return await help_command(update, context)
-
-        # Default response
-        default_msg = "👋 Use the menu buttons below to explore features!\n\n"
-        default_msg += "Type /help to see all available commands."
+    button_handler = _BUTTON_ROUTES.get(update.message.text)
+    if button_handler is not None:
+        return await button_handler(update, context)
 
-        await update.message.reply_text(
-            default_msg,
-            reply_markup=bot.get_main_keyboard()
-        )
+    # A bare DD-MM-YYYY is the partner's date for a pending compatibility check
+    if _COMPAT_DATE_RE.match(update.message.text):
+        return await process_compatibility_date(update, context)
 
-    except Exception as e:
-        logger.error(f"Error handling text message: {e}")
-        await safe_reply(update, "Use the menu buttons to interact with the bot!")
+    text = update.message.text.lower().strip()
+
+    # Route based on message content
+    route = _TEXT_ROUTER_RE.match(text)
+    if route:
+        return await _TEXT_ROUTES[route.lastgroup](update, context)
+
+    # Default response
+    await update.message.reply_text(
+        _DEFAULT_REPLY,
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+    )
 
 
+@admin_only
+@telegram_handler("❌ Couldn't retrieve statistics.")
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Display bot statistics (admin only).
@@ -890,45 +1362,271 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         update: Telegram update object
         context: Handler context
     """
-    try:
-        if not update.effective_user or not update.message:
-            return
+    if not update.message:
+        return
+
+    # Get database stats
+    db_stats = await bot.get_database_stats()
+
+    stats_msg = _STATS_TEMPLATE.format(
+        hours=_metrics.get_uptime() / 3600,
+        users=db_stats.get('total_users', 0),
+        facts=db_stats.get('total_facts', 0),
+        commands=_metrics.total_commands,
+        errors=_metrics.total_errors
+    )
 
-        user_id = update.effective_user.id
+    distribution = db_stats.get('zodiac_distribution')
+    if distribution:
+        stats_msg += _STATS_ZODIAC_HEADER + "\n".join(
+            f"  • {sign}: {count}" for sign, count in sorted(distribution.items())
+        )
+
+    await update.message.reply_text(
+        stats_msg,
+        reply_markup=context.bot_data[MAIN_KEYBOARD_KEY]
+    )
 
-        if not bot.is_admin(user_id):
-            await update.message.reply_text("❌ This command is for admins only.")
-            return
 
-        # Get database stats
-        db_stats = bot.db.get_database_stats()
+async def _send_broadcast(telegram_bot, user_id: int, text: str) -> bool:
+    """
+    Send one broadcast message, reporting failure instead of raising.
 
-        stats_msg = f"📊 **Bot Statistics**\n\n"
-        stats_msg += f"⏱️ **Uptime:** {bot.metrics.get_uptime() / 3600:.2f} hours\n"
-        stats_msg += f"👥 **Total Users:** {db_stats.get('total_users', 0)}\n"
-        stats_msg += f"📝 **Total Facts:** {db_stats.get('total_facts', 0)}\n"
-        stats_msg += f"⚡ **Commands Processed:** {bot.metrics.total_commands}\n"
-        stats_msg += f"❌ **Errors:** {bot.metrics.total_errors}\n\n"
+    Flood control waits the retry_after Telegram asks for; transient network
+    errors back off exponentially. Both give up after BROADCAST_MAX_RETRIES.
+    Permanent errors (bad request, bot blocked) and unexpected exceptions
+    fail immediately.
 
-        if db_stats.get('zodiac_distribution'):
-            stats_msg += "♈ **Zodiac Distribution:**\n"
-            for sign, count in sorted(db_stats['zodiac_distribution'].items()):
-                stats_msg += f"  • {sign}: {count}\n"
+    Args:
+        telegram_bot: Bot used to send the message
+        user_id: Recipient's Telegram user ID
+        text: Message text
 
-        await update.message.reply_text(
-            stats_msg,
-            reply_markup=bot.get_main_keyboard(),
-            parse_mode='Markdown'
+    Returns:
+        bool: True if the message was delivered
+    """
+    for attempt in range(BROADCAST_MAX_RETRIES + 1):
+        try:
+            await telegram_bot.send_message(user_id, text)
+            return True
+        except RetryAfter as e:
+            error, delay = e, e.retry_after
+        except BadRequest as e:
+            # Subclass of NetworkError, but retrying will not help
+            logger.warning("Broadcast to user %s failed: %s", user_id, e)
+            return False
+        except NetworkError as e:
+            error, delay = e, 2 ** attempt
+        except TelegramError as e:
+            logger.warning("Broadcast to user %s failed: %s", user_id, e)
+            return False
+        except Exception as e:
+            # Anything PTB does not wrap must not abort the whole broadcast
+            logger.error("Broadcast to user %s failed unexpectedly: %s", user_id, e, exc_info=True)
+            return False
+
+        if attempt < BROADCAST_MAX_RETRIES:
+            await asyncio.sleep(delay)
+
+    logger.warning("Broadcast to user %s failed after %s retries: %s",
+                   user_id, BROADCAST_MAX_RETRIES, error)
+    return False
+
+
+async def _iter_user_id_pages(max_users: int):
+    """
+    Yield user IDs page by page, stopping after max_users IDs in total.
+
+    Args:
+        max_users: Cap on the number of IDs yielded
+
+    Yields:
+        List[int]: Next page of user IDs
+    """
+    last_user_id = 0
+    remaining = max_users
+    while remaining > 0:
+        page = await bot.run_db(
+            bot.db.get_user_ids_page, last_user_id, min(BROADCAST_PAGE_SIZE, remaining)
         )
+        if not page:
+            return
+        yield page
+        last_user_id = page[-1]
+        remaining -= len(page)
+
+
+async def _run_broadcast(telegram_bot, status_msg, text: str) -> None:
+    """
+    Deliver a broadcast and report the totals on the status message.
+
+    Recipients are read in pages of BROADCAST_PAGE_SIZE, so memory stays flat
+    and sending starts after the first page. Messages go out in concurrent
+    batches of BROADCAST_RATE, at most one batch per second, so delivery runs
+    at Telegram's bot-wide limit instead of one round trip at a time.
+
+    If the task is cancelled (bot shutdown), the status message still gets the
+    totals delivered so far before the cancellation propagates.
+
+    Args:
+        telegram_bot: Bot used to send the messages
+        status_msg: Admin's status message to edit when done
+        text: Message text
+    """
+    loop = asyncio.get_running_loop()
+    next_batch_at = loop.time()
+    sent = failed = 0
+
+    try:
+        async for page in _iter_user_id_pages(bot.config.max_broadcast_users):
+            for start_index in range(0, len(page), BROADCAST_RATE):
+                # Hold each batch to one second after the previous one started
+                delay = next_batch_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_batch_at = loop.time() + 1.0
+
+                results = await asyncio.gather(*(
+                    _send_broadcast(telegram_bot, user_id, text)
+                    for user_id in page[start_index:start_index + BROADCAST_RATE]
+                ))
+                delivered = sum(results)
+                sent += delivered
+                failed += len(results) - delivered
+    except asyncio.CancelledError:
+        logger.warning("Broadcast interrupted: %s sent, %s failed", sent, failed)
+        try:
+            await status_msg.edit_text(
+                _BROADCAST_INTERRUPTED_TEMPLATE.format(sent=sent, failed=failed)
+            )
+        except TelegramError as e:
+            logger.warning("Could not update broadcast status: %s", e)
+        raise
+
+    await status_msg.edit_text(_BROADCAST_DONE_TEMPLATE.format(sent=sent, failed=failed))
+    logger.info("Broadcast finished: %s sent, %s failed", sent, failed)
+
+
+@admin_only
+@telegram_handler("❌ Broadcast failed.")
+async def broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Start sending a message to every user (admin only).
+
+    Delivery runs as a background task so the bot keeps answering other
+    updates meanwhile; the handler returns as soon as it is scheduled.
+
+    Args:
+        update: Telegram update object
+        context: Handler context
+    """
+    if not update.message:
+        return
+
+    if not bot.config.broadcast_enabled:
+        await update.message.reply_text(_BROADCAST_DISABLED)
+        return
+
+    # The message may start on the next line; split on any whitespace but keep
+    # the message's own line breaks
+    parts = update.message.text.split(None, 1)
+    text = parts[1].strip() if len(parts) > 1 else ''
+    if not text:
+        await update.message.reply_text(_BROADCAST_USAGE)
+        return
+
+    if bot.broadcast_task and not bot.broadcast_task.done():
+        await update.message.reply_text(_BROADCAST_RUNNING)
+        return
+
+    status_msg = await update.message.reply_text(_BROADCAST_STARTED)
+    bot.broadcast_task = context.application.create_task(
+        _run_broadcast(context.bot, status_msg, text),
+        update=update,
+        name="broadcast"
+    )
+
 
+def build_handlers(config: Config) -> list:
+    """
+    Build the bot's handlers in dispatch order.
+
+    Commands come first, most-used first, since each one only inspects the
+    command entity. The DOB conversation must precede the text handlers so it
+    can claim replies while a user is mid-conversation.
+
+    Commands that only read state run with block=False so one slow reply does
+    not hold up updates from other chats. Handlers that touch
+    context.user_data stay blocking to keep each user's steps in order.
+
+    Args:
+        config: Bot configuration
+
+    Returns:
+        list: Handlers for Application.add_handlers
+    """
+    set_dob_conv = ConversationHandler(
+        entry_points=[
+            CommandHandler('setdob', start_set_dob),
+            MessageHandler(
+                filters.TEXT & filters.Regex(_DOB_ENTRY_RE),
+                start_set_dob
+            )
+        ],
+        states={
+            SET_DOB_DAY: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_day)],
+            SET_DOB_MONTH: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_month)],
+            SET_DOB_YEAR: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_year)],
+        },
+        fallbacks=[
+            CommandHandler('cancel', cancel_conversation),
+            MessageHandler(filters.Regex(_CANCEL_RE), cancel_conversation)
+        ],
+        conversation_timeout=config.conversation_timeout,
+        name="set_dob_conversation"
+    )
+
+    return [
+        CommandHandler('today', today_reading, block=False),
+        CommandHandler('start', start, block=False),
+        CommandHandler('numerology', numerology_info, block=False),
+        CommandHandler('zodiacsecret', zodiac_secret, block=False),
+        CommandHandler('compatibility', compatibility_check),
+        CommandHandler('help', help_command, block=False),
+        CommandHandler('stats', stats_command, block=False),
+        CommandHandler('broadcast', broadcast_command),
+        set_dob_conv,
+
+        # General text handler (catch-all, also receives compatibility dates)
+        MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message),
+    ]
+
+
+async def _shutdown_step(step_name: str, step) -> None:
+    """
+    Run one application shutdown step, bounded by SHUTDOWN_STEP_TIMEOUT.
+
+    Failures are logged rather than raised so the remaining steps still run.
+
+    Args:
+        step_name: Name used in log messages
+        step: Coroutine function performing the step
+    """
+    try:
+        await asyncio.wait_for(step(), timeout=SHUTDOWN_STEP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Timed out stopping %s after %ss", step_name, SHUTDOWN_STEP_TIMEOUT)
     except Exception as e:
-        logger.error(f"Error in stats_command: {e}")
-        await safe_reply(update, "❌ Couldn't retrieve statistics.")
+        logger.error("Error during shutdown (%s): %s", step_name, e)
 
 
 async def main():
     """Main function with comprehensive error handling and lifecycle management."""
-    global bot
+    global bot, _astro, _metrics
+
+    # Teardown for each lifecycle stage is registered only once that stage has
+    # started, and runs in reverse order: updater, broadcast, application, shutdown
+    lifecycle = contextlib.AsyncExitStack()
 
     try:
         logger.info("=" * 60)
@@ -940,81 +1638,87 @@ async def main():
         config.validate()
         setup_logging(config)
 
+        # Long-running bot: collect less often instead of forcing collections
+        gc.set_threshold(*GC_THRESHOLDS)
+        if config.is_debug_enabled():
+            _install_gc_monitor()
+
         # Initialize bot
         bot = AstrologyBot(config)
+        _astro = bot.astro
+        _metrics = bot.metrics
 
-        # Test database connection
-        if not bot.db.test_connection():
-            raise Exception("Database connection test failed - cannot start bot")
+        # Test database connection on the DB executor while the application is built
+        db_check = bot.run_db(bot.db.test_connection)
 
-        # Setup application
-        application = bot.setup_application()
+        # Setup creates many short-lived objects; keep the collector out of the way
+        gc.disable()
+        try:
+            # Setup application
+            application = bot.setup_application()
 
-        # Setup DOB conversation handler
-        set_dob_conv = ConversationHandler(
-            entry_points=[
-                CommandHandler('setdob', start_set_dob),
-                MessageHandler(
-                    filters.TEXT & filters.Regex(r'(?i).*(set|birth|dob).*'),
-                    start_set_dob
-                )
-            ],
-            states={
-                SET_DOB_DAY: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_day)],
-                SET_DOB_MONTH: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_month)],
-                SET_DOB_YEAR: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_dob_year)],
-            },
-            fallbacks=[
-                CommandHandler('cancel', cancel_conversation),
-                MessageHandler(filters.Regex(r'(?i)(cancel|stop|quit)'), cancel_conversation)
-            ],
-            conversation_timeout=300,
-            name="set_dob_conversation"
-        )
+            # Register all handlers in one batch; order matters within the group
+            application.add_handlers(build_handlers(config))
+        finally:
+            gc.enable()
 
-        # Register all handlers
-        application.add_handler(CommandHandler('start', start))
-        application.add_handler(CommandHandler('help', help_command))
-        application.add_handler(CommandHandler('stats', stats_command))
-        application.add_handler(set_dob_conv)
-        application.add_handler(CommandHandler('today', today_reading))
-        application.add_handler(CommandHandler('numerology', numerology_info))
-        application.add_handler(CommandHandler('zodiacsecret', zodiac_secret))
-        application.add_handler(CommandHandler('compatibility', compatibility_check))
-
-        # Compatibility date handler (must be before general text handler)
-        application.add_handler(
-            MessageHandler(filters.TEXT & filters.Regex(r'^\d{2}-\d{2}-\d{4}), process_compatibility_date)
-                                                        )
-
-        # General text handler (catch-all)
-        application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message)
-        )
+        # Everything built so far lives until exit: sweep startup garbage once,
+        # then move the survivors out of future collections
+        gc.collect()
+        gc.freeze()
 
-        logger.info(f"✓ Admin IDs configured: {config.admin_ids}")
-        logger.info(f"✓ Database: {config.db_path}")
+        if not await db_check:
+            raise Exception("Database connection test failed - cannot start bot")
+
+        logger.info("✓ Admin IDs configured: %s", config.admin_ids)
+        logger.info("✓ Database: %s", config.db_path)
         logger.info("✓ All handlers registered successfully")
         logger.info("🚀 Bot is ready! Press Ctrl+C to stop")
         logger.info("=" * 60)
 
         # Start bot
         await application.initialize()
+        lifecycle.push_async_callback(_shutdown_step, "shutdown", application.shutdown)
         await application.start()
-        await application.updater.start_polling(
-            allowed_updates=Update.ALL_TYPES,
-            drop_pending_updates=True
-        )
+        lifecycle.push_async_callback(_shutdown_step, "application", application.stop)
+        # Application.stop() waits for create_task() tasks, so end a running
+        # broadcast first; this also keeps it off the DB executor before close()
+        lifecycle.push_async_callback(_shutdown_step, "broadcast", bot.cancel_broadcast)
+        if config.webhook_url:
+            # Telegram pushes updates to us; the token keeps the path unguessable
+            await application.updater.start_webhook(
+                listen=config.webhook_listen,
+                port=config.webhook_port,
+                url_path=config.token,
+                webhook_url=f"{config.webhook_url.rstrip('/')}/{config.token}",
+                secret_token=config.webhook_secret or None,
+                allowed_updates=_ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+            logger.info("✓ Receiving updates via webhook on port %s", config.webhook_port)
+        else:
+            await application.updater.start_polling(
+                allowed_updates=_ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+        lifecycle.push_async_callback(_shutdown_step, "updater", application.updater.stop)
 
         # Setup signal handlers for graceful shutdown
-        stop_event = asyncio.Event()
+        stop_event = bot.get_shutdown_event()
 
-        def signal_handler(sig, frame):
-            logger.info(f"📡 Received signal {sig} - initiating shutdown")
+        def signal_handler(sig, frame=None):
+            logger.info("📡 Received signal %s - initiating shutdown", sig)
             stop_event.set()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        if sys.platform.startswith('win'):
+            # The Proactor loop has no add_signal_handler
+            signal.signal(signal.SIGINT, signal_handler)
+            signal.signal(signal.SIGTERM, signal_handler)
+        else:
+            # Runs on the loop itself, so the event is set without waiting for a wake-up
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, signal_handler, sig)
 
         # Wait for shutdown signal
         await stop_event.wait()
@@ -1022,25 +1726,22 @@ async def main():
     except KeyboardInterrupt:
         logger.info("⌨️  Keyboard interrupt received")
     except Exception as e:
-        logger.error(f"💥 Fatal error: {e}", exc_info=True)
+        logger.error("💥 Fatal error: %s", e, exc_info=True)
         sys.exit(1)
     finally:
         # Cleanup
         if bot:
             bot.state = BotState.STOPPING
 
-        if 'application' in locals() and application:
-            try:
-                logger.info("🛑 Stopping application...")
-                await application.updater.stop()
-                await application.stop()
-                await application.shutdown()
-                logger.info("✓ Application stopped cleanly")
-            except Exception as e:
-                logger.error(f"Error during shutdown: {e}")
+        logger.info("🛑 Stopping application...")
+        await lifecycle.aclose()
 
-        # Force garbage collection
-        gc.collect()
+        if bot:
+            bot.close()
+
+        # The process is exiting anyway; only collect when hunting leaks
+        if bot and bot.config.is_debug_enabled():
+            gc.collect()
 
         if bot:
             bot.state = BotState.STOPPED
@@ -1055,7 +1756,19 @@ def run_bot():
     try:
         # Configure event loop for Windows
         if sys.platform.startswith('win'):
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+            # winloop is the libuv loop for Windows; Proactor is the stock fallback
+            try:
+                import winloop
+                winloop.install()
+            except ImportError:
+                asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # libuv-based loop; fall back to the stock selector loop if missing
+            try:
+                import uvloop
+                uvloop.install()
+            except ImportError:
+                logger.debug("uvloop not installed - using default asyncio event loop")
 
         # Run the bot
         asyncio.run(main())
@@ -1064,7 +1777,7 @@ def run_bot():
         logger.info("Bot stopped by user")
         print("\n✓ Bot stopped gracefully")
     except Exception as e:
-        logger.error(f"Fatal error in run_bot: {e}", exc_info=True)
+        logger.error("Fatal error in run_bot: %s", e, exc_info=True)
         print(f"\n💥 Fatal error: {e}")
         sys.exit(1)
 
@@ -2,14 +2,36 @@
 Astrology and numerology calculation utilities
 """
 import random
+import bisect
 import calendar
+import functools
 from datetime import date
 from typing import Tuple
 from constants import (
     HOROSCOPE_TEMPLATES, LIFE_PATH_MEANINGS,
-    ZODIAC_ELEMENTS, ELEMENT_COMPATIBILITY
+    ZODIAC_ELEMENTS, ELEMENT_COMPATIBILITY, ZODIAC_DATES
 )
 
+MASTER_NUMBERS = frozenset((11, 22, 33))
+
+# Sign start dates (month*100 + day) in calendar order, derived from ZODIAC_DATES
+_ZODIAC_STARTS = sorted(
+    (ranges[0], sign)
+    for sign, spans in ZODIAC_DATES.items()
+    for ranges in (spans if isinstance(spans, list) else [spans])
+)
+_ZODIAC_START_KEYS = tuple(start for start, _ in _ZODIAC_STARTS)
+_ZODIAC_START_SIGNS = tuple(sign for _, sign in _ZODIAC_STARTS)
+
+
+def _digit_sum(number: int) -> int:
+    """Sum the decimal digits of a non-negative integer."""
+    total = 0
+    while number:
+        number, digit = divmod(number, 10)
+        total += digit
+    return total
+
 
 class AstrologyCalculator:
     """Handles all astrology and numerology calculations."""
@@ -17,51 +39,31 @@ class AstrologyCalculator:
     @staticmethod
     def get_zodiac_sign(birth_date: date) -> str:
         """Calculate zodiac sign from birth date with proper Capricorn handling."""
-        month = birth_date.month
-        day = birth_date.day
-
-        # Zodiac date ranges with proper handling
-        zodiac_ranges = [
-            ((3, 21), (4, 19), "Aries"),
-            ((4, 20), (5, 20), "Taurus"),
-            ((5, 21), (6, 20), "Gemini"),
-            ((6, 21), (7, 22), "Cancer"),
-            ((7, 23), (8, 22), "Leo"),
-            ((8, 23), (9, 22), "Virgo"),
-            ((9, 23), (10, 22), "Libra"),
-            ((10, 23), (11, 21), "Scorpio"),
-            ((11, 22), (12, 21), "Sagittarius"),
-            ((12, 22), (12, 31), "Capricorn"),
-            ((1, 1), (1, 19), "Capricorn"),
-            ((1, 20), (2, 18), "Aquarius"),
-            ((2, 19), (3, 20), "Pisces"),
-        ]
-
-        for (start_month, start_day), (end_month, end_day), sign in zodiac_ranges:
-            if (month == start_month and day >= start_day) or \
-               (month == end_month and day <= end_day):
-                return sign
-
-        return "Capricorn"  # Fallback
+        # Find the last sign starting on or before this day of the year
+        key = birth_date.month * 100 + birth_date.day
+        index = bisect.bisect_right(_ZODIAC_START_KEYS, key) - 1
+        return _ZODIAC_START_SIGNS[index]
 
     @staticmethod
     def calculate_life_path(birth_date: date) -> int:
         """Calculate life path number with proper reduction and master number preservation."""
-        # Get full birth date as string of digits
-        date_str = birth_date.strftime("%d%m%Y")
-
-        # Sum all digits
-        digit_sum = sum(int(digit) for digit in date_str)
+        # Sum all digits of DD, MM and YYYY using integer arithmetic
+        digit_sum = (
+            _digit_sum(birth_date.day)
+            + _digit_sum(birth_date.month)
+            + _digit_sum(birth_date.year)
+        )
 
         # Reduce while preserving master numbers (11, 22, 33)
-        while digit_sum > 9 and digit_sum not in [11, 22, 33]:
-            digit_sum = sum(int(digit) for digit in str(digit_sum))
+        while digit_sum > 9 and digit_sum not in MASTER_NUMBERS:
+            digit_sum = _digit_sum(digit_sum)
 
         return digit_sum
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def get_life_path_calculation_steps(birth_date: date) -> str:
-        """Get step-by-step calculation for life path number."""
+        """Get step-by-step calculation for life path number (memoized per date)."""
         date_digits = birth_date.strftime("%d%m%Y")
         digit_sum = sum(int(d) for d in date_digits)
 
@@ -70,13 +72,13 @@ class AstrologyCalculator:
 
         # Show reduction steps
         temp_sum = digit_sum
-        while temp_sum > 9 and temp_sum not in [11, 22, 33]:
+        while temp_sum > 9 and temp_sum not in MASTER_NUMBERS:
             temp_digits = [int(d) for d in str(temp_sum)]
             new_sum = sum(temp_digits)
             calculation_steps += f"Reduce: {' + '.join(map(str, temp_digits))} = {new_sum}\n"
             temp_sum = new_sum
 
-        if temp_sum in [11, 22, 33]:
+        if temp_sum in MASTER_NUMBERS:
             calculation_steps += f"\nMaster Number: {temp_sum} (not reduced further)"
         else:
             calculation_steps += f"\nLife Path Number: {temp_sum}"
@@ -112,10 +114,12 @@ class AstrologyCalculator:
         )
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def calculate_compatibility(user_zodiac: str, user_life_path: int,
                               other_zodiac: str, other_life_path: int) -> Tuple[int, int, int, str]:
         """
-        Calculate compatibility between two people.
+        Calculate compatibility between two people (memoized; 12 signs and
+        12 life path numbers bound the inputs to about 20k combinations).
         Returns: (zodiac_score, numerology_score, overall_score, compatibility_level)
         """
         # Get elements
@@ -242,7 +246,7 @@ class AstrologyCalculator:
     @staticmethod
     def get_numerology_info(life_path: int) -> dict:
         """Get comprehensive numerology information."""
-        is_master = life_path in [11, 22, 33]
+        is_master = life_path in MASTER_NUMBERS
         
         return {
             'number': life_path,
@@ -3,6 +3,7 @@ Enhanced Configuration management for Astrology Bot
 Fixes compatibility issues with python-telegram-bot 21.x
 """
 import os
+import re
 import logging
 import sys
 from dataclasses import dataclass, field
@@ -41,12 +42,21 @@ class Config:
     fallback_mode: bool = True  # Use fallback messages when markdown fails
     rate_limit_enabled: bool = True
     debug_mode: bool = False
+    verify_writes: bool = False  # Re-read rows after saving (debugging aid)
 
     # Connection settings
     request_timeout: float = 30.0
-    connection_pool_size: int = 8
+    connection_pool_size: int = 32
+    pool_timeout: float = 5.0
+    http_version: str = "1.1"
     retry_attempts: int = 3
 
+    # Update delivery (webhook is used when webhook_url is set, polling otherwise)
+    webhook_url: str = ""
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    webhook_secret: str = ""  # Sent back by Telegram in X-Telegram-Bot-Api-Secret-Token
+
     # Admin settings
     admin_commands_enabled: bool = True
     broadcast_enabled: bool = True
@@ -137,12 +147,21 @@ class Config:
             fallback_mode=parse_bool('FALLBACK_MODE', True),
             rate_limit_enabled=parse_bool('RATE_LIMIT_ENABLED', True),
             debug_mode=parse_bool('DEBUG_MODE', False),
+            verify_writes=parse_bool('VERIFY_WRITES', False),
 
             # Connection settings
             request_timeout=parse_float('REQUEST_TIMEOUT', 30.0),
-            connection_pool_size=parse_int('CONNECTION_POOL_SIZE', 8),
+            connection_pool_size=parse_int('CONNECTION_POOL_SIZE', 32),
+            pool_timeout=parse_float('POOL_TIMEOUT', 5.0),
+            http_version=os.getenv('HTTP_VERSION', '1.1').strip(),
             retry_attempts=parse_int('RETRY_ATTEMPTS', 3),
 
+            # Update delivery
+            webhook_url=os.getenv('WEBHOOK_URL', '').strip(),
+            webhook_listen=os.getenv('WEBHOOK_LISTEN', '0.0.0.0').strip(),
+            webhook_port=parse_int('WEBHOOK_PORT', 8443),
+            webhook_secret=os.getenv('WEBHOOK_SECRET', '').strip(),
+
             # Admin settings
             admin_commands_enabled=parse_bool('ADMIN_COMMANDS_ENABLED', True),
             broadcast_enabled=parse_bool('BROADCAST_ENABLED', True),
@@ -194,9 +213,24 @@ class Config:
         if self.connection_pool_size <= 0:
             errors.append("Connection pool size must be positive!")
 
+        if self.pool_timeout <= 0:
+            errors.append("Pool timeout must be positive!")
+
+        if self.http_version not in ('1.1', '2'):
+            errors.append(f"Invalid HTTP version: {self.http_version}. Use '1.1' or '2'")
+
         if self.retry_attempts < 0:
             errors.append("Retry attempts cannot be negative!")
 
+        if self.webhook_url and not self.webhook_url.startswith('https://'):
+            errors.append("Webhook URL must start with https://")
+
+        if not (0 < self.webhook_port < 65536):
+            errors.append(f"Invalid webhook port: {self.webhook_port}")
+
+        if self.webhook_secret and not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', self.webhook_secret):
+            errors.append("Webhook secret must be 1-256 characters of A-Z, a-z, 0-9, _ or -")
+
         # Validate log level
         valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
         if self.log_level not in valid_levels:
@@ -297,13 +331,13 @@ def setup_logging(config: Config) -> None:
 
     # Log configuration info
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured: level={config.log_level}")
+    logger.info("Logging configured: level=%s", config.log_level)
     if file_handler:
-        logger.info(f"Log file: {config.log_file}")
+        logger.info("Log file: %s", config.log_file)
 
     if config.is_debug_enabled():
         logger.debug("Debug mode enabled")
-        logger.debug(f"Configuration: {config}")
+        logger.debug("Configuration: %s", config)
 
 
 def validate_environment() -> None:
@@ -361,14 +395,25 @@ SUPPORT_MESSAGE=Support our bot development!
 ENABLE_MARKDOWN=true
 FALLBACK_MODE=true
 DEBUG_MODE=false
+VERIFY_WRITES=false
 
 # Performance settings (optional)
 MAX_BROADCAST_USERS=1000
 CONVERSATION_TIMEOUT=300
 REQUEST_TIMEOUT=30.0
-CONNECTION_POOL_SIZE=8
+CONNECTION_POOL_SIZE=32
+POOL_TIMEOUT=5.0
+# HTTP_VERSION=2 requires: pip install "httpx[http2]"
+HTTP_VERSION=1.1
 RETRY_ATTEMPTS=3
 
+# Webhook delivery (optional - leave WEBHOOK_URL empty to use polling)
+# Requires: pip install "python-telegram-bot[webhooks]"
+WEBHOOK_URL=
+WEBHOOK_LISTEN=0.0.0.0
+WEBHOOK_PORT=8443
+WEBHOOK_SECRET=
+
 # Admin features (optional)
 ADMIN_COMMANDS_ENABLED=true
 BROADCAST_ENABLED=true
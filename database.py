@@ -3,6 +3,7 @@ Database management for Astrology Bot - Enhanced with better error handling and
 """
 import sqlite3
 import logging
+import threading
 from datetime import date, datetime
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
@@ -32,13 +33,17 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._connection_timeout = 10.0
-        logger.info(f"Initializing database at: {db_path}")
+        self._mmap_size = 256 * 1024 * 1024  # bytes of the file mapped for reads
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        logger.info("Initializing database at: %s", db_path)
 
         try:
             self._ensure_db_directory()
             self._init_database()
         except Exception as e:
-            logger.error(f"Database initialization failed: {e}")
+            logger.error("Database initialization failed: %s", e)
             raise DatabaseError(f"Failed to initialize database: {e}") from e
 
     def _ensure_db_directory(self) -> None:
@@ -51,38 +56,92 @@ class DatabaseManager:
         try:
             db_dir = Path(self.db_path).parent
             db_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Database directory verified: {db_dir}")
+            logger.info("Database directory verified: %s", db_dir)
         except Exception as e:
-            logger.error(f"Failed to create database directory: {e}")
+            logger.error("Failed to create database directory: %s", e)
             raise
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Open a connection for the calling thread and apply per-connection settings.
+
+        Returns:
+            sqlite3.Connection: New database connection
+        """
+        # check_same_thread=False only so close() can run from the shutdown thread;
+        # each connection is otherwise used by the thread that opened it
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self._connection_timeout,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size}")
+
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _discard_connection(self, conn: sqlite3.Connection) -> None:
+        """
+        Close a broken connection so the next call on this thread reopens it.
+
+        Args:
+            conn: Connection to discard
+        """
+        self._local.conn = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Error closing connection: %s", e)
+
     @contextmanager
     def _get_connection(self):
         """
         Context manager for database connections.
 
+        Each worker thread keeps one open connection and reuses it, so queries
+        skip the file open and PRAGMA setup after the first call.
+
         Yields:
             sqlite3.Connection: Database connection
 
         Raises:
             DatabaseError: If connection fails
         """
-        conn = None
+        conn = getattr(self._local, 'conn', None)
         try:
-            conn = sqlite3.connect(self.db_path, timeout=self._connection_timeout)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON")
-            conn.execute("PRAGMA journal_mode = WAL")
+            if conn is None:
+                conn = self._local.conn = self._open_connection()
             yield conn
         except sqlite3.Error as e:
-            logger.error(f"Database connection error: {e}")
+            logger.error("Database connection error: %s", e)
+            if conn is not None:
+                self._discard_connection(conn)
             raise DatabaseError(f"Failed to connect to database: {e}") from e
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except sqlite3.Error as e:
-                    logger.warning(f"Error closing connection: {e}")
+        except BaseException:
+            # Never leave a half-finished transaction on a reused connection
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close every connection opened by this manager."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Error closing connection: %s", e)
+        logger.info("Database connections closed")
 
     def _init_database(self) -> None:
         """
@@ -93,6 +152,8 @@ class DatabaseManager:
         """
         try:
             with self._get_connection() as conn:
+                # WAL is persistent in the database file, so set it once here
+                conn.execute("PRAGMA journal_mode = WAL")
                 cursor = conn.cursor()
 
                 # Users table with comprehensive constraints
@@ -142,16 +203,17 @@ class DatabaseManager:
                         'INSERT INTO facts (day, month, fact_type, fact_text) VALUES (?, ?, ?, ?)',
                         SAMPLE_FACTS
                     )
-                    logger.info(f"Inserted {len(SAMPLE_FACTS)} facts into database")
+                    logger.info("Inserted %s facts into database", len(SAMPLE_FACTS))
 
                 conn.commit()
                 logger.info("Database initialized successfully")
 
         except Exception as e:
-            logger.error(f"Database initialization failed: {e}", exc_info=True)
+            logger.error("Database initialization failed: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to initialize database tables: {e}") from e
 
-    def save_user_dob(self, user_id: int, birth_date: date, zodiac: str, life_path: int) -> bool:
+    def save_user_dob(self, user_id: int, birth_date: date, zodiac: str,
+                      life_path: int) -> Optional[Tuple[str, str, int]]:
         """
         Save or update user's date of birth with comprehensive validation.
 
@@ -162,72 +224,60 @@ class DatabaseManager:
             life_path: Life path number
 
         Returns:
-            bool: True if successful, False otherwise
+            Optional[Tuple]: The stored (dob_str, zodiac_sign, life_path_number), or None on failure
         """
         if not isinstance(user_id, int) or user_id <= 0:
-            logger.error(f"Invalid user_id: {user_id}")
-            return False
+            logger.error("Invalid user_id: %s", user_id)
+            return None
 
         if not isinstance(birth_date, date):
-            logger.error(f"Invalid birth_date type: {type(birth_date)}")
-            return False
+            logger.error("Invalid birth_date type: %s", type(birth_date))
+            return None
 
         if not zodiac or not isinstance(zodiac, str):
-            logger.error(f"Invalid zodiac: {zodiac}")
-            return False
+            logger.error("Invalid zodiac: %s", zodiac)
+            return None
 
         if not isinstance(life_path, int) or not (1 <= life_path <= 33):
-            logger.error(f"Invalid life_path: {life_path}")
-            return False
+            logger.error("Invalid life_path: %s", life_path)
+            return None
 
         try:
-            logger.info(f"Saving DOB for user {user_id}")
-            logger.debug(f"Data: date={birth_date}, zodiac={zodiac}, life_path={life_path}")
+            logger.info("Saving DOB for user %s", user_id)
+            logger.debug("Data: date=%s, zodiac=%s, life_path=%s", birth_date, zodiac, life_path)
 
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 dob_str = birth_date.isoformat()
 
-                # Check if user exists
-                cursor.execute('SELECT user_id FROM users WHERE user_id = ?', (user_id,))
-                exists = cursor.fetchone()
-
-                if exists:
-                    logger.info(f"Updating existing user {user_id}")
-                    cursor.execute('''
-                        UPDATE users 
-                        SET dob = ?, zodiac_sign = ?, life_path_number = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE user_id = ?
-                    ''', (dob_str, zodiac, life_path, user_id))
-                else:
-                    logger.info(f"Inserting new user {user_id}")
-                    cursor.execute('''
-                        INSERT INTO users (user_id, dob, zodiac_sign, life_path_number)
-                        VALUES (?, ?, ?, ?)
-                    ''', (user_id, dob_str, zodiac, life_path))
-
+                # Single upsert instead of existence check + write + re-read
+                cursor.execute('''
+                    INSERT INTO users (user_id, dob, zodiac_sign, life_path_number)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        dob = excluded.dob,
+                        zodiac_sign = excluded.zodiac_sign,
+                        life_path_number = excluded.life_path_number,
+                        updated_at = CURRENT_TIMESTAMP
+                ''', (user_id, dob_str, zodiac, life_path))
                 conn.commit()
 
-                # Verify the save
-                cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-                saved_user = cursor.fetchone()
-
-                if saved_user:
-                    logger.info(f"Successfully saved DOB for user {user_id}: {zodiac}, Life Path {life_path}")
-                    return True
+                if cursor.rowcount == 1:
+                    logger.info("Successfully saved DOB for user %s: %s, Life Path %s", user_id, zodiac, life_path)
+                    return (dob_str, zodiac, life_path)
                 else:
-                    logger.error("Save appeared to succeed but user not found in database")
-                    return False
+                    logger.error("Save appeared to succeed but no row was written")
+                    return None
 
         except sqlite3.IntegrityError as e:
-            logger.error(f"Integrity error saving DOB for user {user_id}: {e}")
-            return False
+            logger.error("Integrity error saving DOB for user %s: %s", user_id, e)
+            return None
         except sqlite3.OperationalError as e:
-            logger.error(f"Database operational error for user {user_id}: {e}")
-            return False
+            logger.error("Database operational error for user %s: %s", user_id, e)
+            return None
         except Exception as e:
-            logger.error(f"Unexpected error saving DOB for user {user_id}: {e}", exc_info=True)
-            return False
+            logger.error("Unexpected error saving DOB for user %s: %s", user_id, e, exc_info=True)
+            return None
 
     def get_user_data(self, user_id: int) -> Optional[Tuple[str, str, int]]:
         """
@@ -240,11 +290,11 @@ class DatabaseManager:
             Optional[Tuple]: (dob_str, zodiac_sign, life_path_number) or None
         """
         if not isinstance(user_id, int) or user_id <= 0:
-            logger.error(f"Invalid user_id: {user_id}")
+            logger.error("Invalid user_id: %s", user_id)
             return None
 
         try:
-            logger.debug(f"Fetching data for user {user_id}")
+            logger.debug("Fetching data for user %s", user_id)
 
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -255,14 +305,14 @@ class DatabaseManager:
                 result = cursor.fetchone()
 
                 if result:
-                    logger.debug(f"Found data for user {user_id}")
+                    logger.debug("Found data for user %s", user_id)
                     return (result['dob'], result['zodiac_sign'], result['life_path_number'])
                 else:
-                    logger.debug(f"No data found for user {user_id}")
+                    logger.debug("No data found for user %s", user_id)
                     return None
 
         except Exception as e:
-            logger.error(f"Failed to get data for user {user_id}: {e}", exc_info=True)
+            logger.error("Failed to get data for user %s: %s", user_id, e, exc_info=True)
             return None
 
     def get_random_fact(self, day: Optional[int] = None, month: Optional[int] = None) -> Optional[Tuple[str, str]]:
@@ -282,7 +332,7 @@ class DatabaseManager:
 
                 if day and month:
                     if not (1 <= day <= 31 and 1 <= month <= 12):
-                        logger.warning(f"Invalid day/month: {day}/{month}")
+                        logger.warning("Invalid day/month: %s/%s", day, month)
                         day, month = None, None
 
                 if day and month:
@@ -310,9 +360,26 @@ class DatabaseManager:
                 return (result['fact_text'], result['fact_type']) if result else None
 
         except Exception as e:
-            logger.error(f"Failed to get random fact: {e}")
+            logger.error("Failed to get random fact: %s", e)
             return None
 
+    def get_user_and_random_fact(
+        self, user_id: int
+    ) -> Tuple[Optional[Tuple[str, str, int]], Optional[Tuple[str, str]]]:
+        """
+        Get a user's data and a random fact in one call.
+
+        Both reads run on the calling thread's connection, so callers that
+        dispatch to a worker thread pay for a single hand-off instead of two.
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            Tuple: (get_user_data result, get_random_fact result)
+        """
+        return self.get_user_data(user_id), self.get_random_fact()
+
     def get_all_users(self) -> List[int]:
         """
         Get list of all user IDs.
@@ -328,7 +395,34 @@ class DatabaseManager:
                 return [row['user_id'] for row in results]
 
         except Exception as e:
-            logger.error(f"Failed to get all users: {e}")
+            logger.error("Failed to get all users: %s", e)
+            return []
+
+    def get_user_ids_page(self, after_user_id: int = 0, limit: int = 1000) -> List[int]:
+        """
+        Get one page of user IDs in ascending order.
+
+        Uses keyset pagination on the primary key, so each page is an index
+        range scan no matter how far into the table it starts.
+
+        Args:
+            after_user_id: Only return IDs greater than this (last ID of the previous page)
+            limit: Maximum number of IDs to return
+
+        Returns:
+            List[int]: User IDs, empty once there are no more
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT user_id FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?',
+                    (after_user_id, limit)
+                )
+                return [row['user_id'] for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error("Failed to get user IDs after %s: %s", after_user_id, e)
             return []
 
     def get_user_count(self) -> int:
@@ -346,7 +440,7 @@ class DatabaseManager:
                 return result['count'] if result else 0
 
         except Exception as e:
-            logger.error(f"Failed to get user count: {e}")
+            logger.error("Failed to get user count: %s", e)
             return 0
 
     def delete_user(self, user_id: int) -> bool:
@@ -360,7 +454,7 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         if not isinstance(user_id, int) or user_id <= 0:
-            logger.error(f"Invalid user_id: {user_id}")
+            logger.error("Invalid user_id: %s", user_id)
             return False
 
         try:
@@ -371,14 +465,14 @@ class DatabaseManager:
 
                 deleted_count = cursor.rowcount
                 if deleted_count > 0:
-                    logger.info(f"Deleted user {user_id}")
+                    logger.info("Deleted user %s", user_id)
                     return True
                 else:
-                    logger.warning(f"User {user_id} not found for deletion")
+                    logger.warning("User %s not found for deletion", user_id)
                     return False
 
         except Exception as e:
-            logger.error(f"Failed to delete user {user_id}: {e}")
+            logger.error("Failed to delete user %s: %s", user_id, e)
             return False
 
     def add_fact(self, fact_text: str, fact_type: str, day: Optional[int] = None, month: Optional[int] = None) -> bool:
@@ -399,11 +493,11 @@ class DatabaseManager:
             return False
 
         if day and not (1 <= day <= 31):
-            logger.error(f"Invalid day: {day}")
+            logger.error("Invalid day: %s", day)
             return False
 
         if month and not (1 <= month <= 12):
-            logger.error(f"Invalid month: {month}")
+            logger.error("Invalid month: %s", month)
             return False
 
         try:
@@ -414,11 +508,11 @@ class DatabaseManager:
                     (day, month, fact_type, fact_text)
                 )
                 conn.commit()
-                logger.info(f"Added new {fact_type} fact")
+                logger.info("Added new %s fact", fact_type)
                 return True
 
         except Exception as e:
-            logger.error(f"Failed to add fact: {e}")
+            logger.error("Failed to add fact: %s", e)
             return False
 
     def get_database_stats(self) -> Dict:
@@ -454,7 +548,7 @@ class DatabaseManager:
                 return stats
 
         except Exception as e:
-            logger.error(f"Failed to get database stats: {e}")
+            logger.error("Failed to get database stats: %s", e)
             return {}
 
     def test_connection(self) -> bool:
@@ -489,17 +583,20 @@ class DatabaseManager:
                 cursor.execute("SELECT COUNT(*) as count FROM facts")
                 fact_count = cursor.fetchone()['count']
 
-                logger.info(f"Database test passed. Users: {user_count}, Facts: {fact_count}")
+                logger.info("Database test passed. Users: %s, Facts: %s", user_count, fact_count)
                 return True
 
         except Exception as e:
-            logger.error(f"Database test failed: {e}", exc_info=True)
+            logger.error("Database test failed: %s", e, exc_info=True)
             return False
 
     def backup_database(self, backup_path: str) -> bool:
         """
         Create a backup of the database.
 
+        Uses SQLite's online backup API, so committed changes that still live
+        in the WAL file are included; copying the main file alone would miss them.
+
         Args:
             backup_path: Path for backup file
 
@@ -507,12 +604,16 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
-            logger.info(f"Database backed up to {backup_path}")
+            with self._get_connection() as conn:
+                backup_conn = sqlite3.connect(backup_path)
+                try:
+                    conn.backup(backup_conn)
+                finally:
+                    backup_conn.close()
+            logger.info("Database backed up to %s", backup_path)
             return True
         except Exception as e:
-            logger.error(f"Failed to backup database: {e}")
+            logger.error("Failed to backup database: %s", e)
             return False
 
     def cleanup_old_users(self, days: int = 365) -> int:
@@ -535,9 +636,9 @@ class DatabaseManager:
                 conn.commit()
 
                 deleted = cursor.rowcount
-                logger.info(f"Cleaned up {deleted} inactive users")
+                logger.info("Cleaned up %s inactive users", deleted)
                 return deleted
 
         except Exception as e:
-            logger.error(f"Failed to cleanup old users: {e}")
+            logger.error("Failed to cleanup old users: %s", e)
             return 0
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Tests for the Telegram application wiring in AstrologyBot."""
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import astrology_bot_improved as bot_module
+from config import Config
+
+
+class SetupApplicationTests(unittest.TestCase):
+    """setup_application must keep pool sizing and HTTP version with keepalive on."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _build(self, **overrides):
+        config = Config(
+            token='123456:' + 'a' * 35,
+            admin_ids=[1],
+            db_path=os.path.join(self._tmp.name, 'bot.db'),
+            **overrides
+        )
+        bot = bot_module.AstrologyBot(config)
+        self.addCleanup(bot.close)
+        application = bot.setup_application()
+        general, get_updates = application.bot._request[1], application.bot._request[0]
+        return config, general, get_updates
+
+    @staticmethod
+    def _pool(request):
+        return request._client._transport._pool
+
+    def test_pool_limits_include_broadcast_headroom(self):
+        config, general, _ = self._build()
+        pool = self._pool(general)
+        expected = config.connection_pool_size + bot_module.BROADCAST_RATE
+        self.assertEqual(pool._max_connections, expected)
+        self.assertEqual(pool._max_keepalive_connections, expected)
+
+    def test_pool_limits_without_broadcast(self):
+        config, general, _ = self._build(broadcast_enabled=False)
+        self.assertEqual(self._pool(general)._max_connections, config.connection_pool_size)
+
+    def test_get_updates_uses_single_connection(self):
+        _, _, get_updates = self._build()
+        self.assertEqual(self._pool(get_updates)._max_connections, 1)
+
+    def test_keepalive_socket_options_applied(self):
+        _, general, get_updates = self._build()
+        for request in (general, get_updates):
+            self.assertEqual(
+                tuple(self._pool(request)._socket_options), bot_module._SOCKET_OPTIONS
+            )
+
+    def test_http1_by_default(self):
+        _, general, _ = self._build()
+        self.assertFalse(self._pool(general)._http2)
+
+    @unittest.skipUnless(importlib.util.find_spec('h2'), "HTTP/2 needs the h2 package")
+    def test_http2_setting_reaches_transport(self):
+        _, general, get_updates = self._build(http_version='2')
+        self.assertTrue(self._pool(general)._http2)
+        self.assertTrue(self._pool(get_updates)._http2)
+
+
+if __name__ == '__main__':
+    unittest.main()
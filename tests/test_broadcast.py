@@ -0,0 +1,114 @@
+"""Tests for the /broadcast delivery loop."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+import astrology_bot_improved as bot_module
+from config import Config
+
+
+class FakeStatusMessage:
+    """Records the texts the broadcast writes to the admin's status message."""
+
+    def __init__(self):
+        self.edits = []
+
+    async def edit_text(self, text, **kwargs):
+        self.edits.append(text)
+
+
+class BroadcastTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs against a real AstrologyBot on a temporary database."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        config = Config(
+            token='123456:' + 'a' * 35,
+            admin_ids=[1],
+            db_path=os.path.join(self._tmp.name, 'bot.db')
+        )
+        self.bot = bot_module.AstrologyBot(config)
+        self.addCleanup(self.bot.close)
+        patcher = mock.patch.object(bot_module, 'bot', self.bot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for user_id in (2, 3, 4, 5):
+            self.bot.db.save_user_dob(user_id, date(1990, 1, 1), 'Capricorn', 2)
+        self.sent = []
+
+    async def send_message(self, user_id, text):
+        self.sent.append((user_id, text))
+
+
+class RunBroadcastTests(BroadcastTestCase):
+
+    async def test_unexpected_error_counts_as_failure(self):
+        async def send_message(user_id, text):
+            if user_id == 3:
+                raise RuntimeError("transport exploded")
+            await self.send_message(user_id, text)
+
+        status = FakeStatusMessage()
+        await bot_module._run_broadcast(
+            SimpleNamespace(send_message=send_message), status, "hello"
+        )
+
+        self.assertEqual([user_id for user_id, _ in self.sent], [2, 4, 5])
+        self.assertEqual(
+            status.edits,
+            [bot_module._BROADCAST_DONE_TEMPLATE.format(sent=3, failed=1)]
+        )
+
+
+
+class BroadcastCommandTests(BroadcastTestCase):
+
+    async def _command(self, text):
+        replies = []
+
+        async def reply_text(reply, **kwargs):
+            replies.append(reply)
+            return FakeStatusMessage()
+
+        message = SimpleNamespace(text=text, reply_text=reply_text)
+        update = SimpleNamespace(
+            effective_user=SimpleNamespace(id=1), message=message, effective_message=message
+        )
+        context = SimpleNamespace(
+            bot=SimpleNamespace(send_message=self.send_message),
+            bot_data={},
+            application=SimpleNamespace(
+                create_task=lambda coro, update=None, name=None: asyncio.create_task(coro)
+            )
+        )
+        await bot_module.broadcast_command(update, context)
+        if self.bot.broadcast_task is not None:
+            await self.bot.broadcast_task
+        return replies
+
+    async def test_message_on_following_lines_is_sent_intact(self):
+        replies = await self._command("/broadcast\nLine one\nLine two")
+
+        self.assertEqual(replies, [bot_module._BROADCAST_STARTED])
+        self.assertEqual({text for _, text in self.sent}, {"Line one\nLine two"})
+        self.assertEqual(len(self.sent), 4)
+
+    async def test_space_separated_message(self):
+        await self._command("/broadcast hello all")
+        self.assertEqual({text for _, text in self.sent}, {"hello all"})
+
+    async def test_missing_message_shows_usage(self):
+        replies = await self._command("/broadcast \n ")
+        self.assertEqual(replies, [bot_module._BROADCAST_USAGE])
+        self.assertEqual(self.sent, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
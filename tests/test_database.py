@@ -0,0 +1,39 @@
+"""Tests for DatabaseManager."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from database import DatabaseManager
+
+
+class BackupDatabaseTests(unittest.TestCase):
+    """backup_database must capture writes that are still in the WAL file."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db = DatabaseManager(os.path.join(self._tmp.name, 'bot.db'))
+        self.addCleanup(self.db.close)
+
+    def test_backup_right_after_write_contains_row(self):
+        self.assertTrue(self.db.save_user_dob(42, date(1990, 6, 15), 'Gemini', 4))
+
+        backup_path = os.path.join(self._tmp.name, 'backup.db')
+        self.assertTrue(self.db.backup_database(backup_path))
+
+        conn = sqlite3.connect(backup_path)
+        try:
+            row = conn.execute(
+                'SELECT dob, zodiac_sign, life_path_number FROM users WHERE user_id = ?',
+                (42,)
+            ).fetchone()
+        finally:
+            conn.close()
+        self.assertEqual(row, ('1990-06-15', 'Gemini', 4))
+
+
+if __name__ == '__main__':
+    unittest.main()